@@ -105,6 +105,13 @@ def create_app(config_class=Config):
         'accept_content': ['json'],
         'timezone': 'UTC',
         'enable_utc': True,
+        'worker_max_tasks_per_child': app.config['CELERY_WORKER_MAX_TASKS_PER_CHILD'],
+        'worker_max_memory_per_child': app.config['CELERY_WORKER_MAX_MEMORY_PER_CHILD'],
+        'worker_concurrency': app.config['CELERY_WORKER_CONCURRENCY'],
+        # Thumbnails run on their own queue so they never delay renders
+        'task_routes': {
+            'app.tasks.generate_thumbnail': {'queue': 'thumbnails'},
+        },
     }
     
     # Add eager mode settings for development (run tasks synchronously)
@@ -118,11 +125,21 @@ def create_app(config_class=Config):
     
     # Register Celery tasks
     from app.tasks.poster_tasks import register_tasks
-    generate_poster_task, generate_batch_posters_task = register_tasks(celery)
+    generate_poster_task, generate_batch_posters_task, generate_thumbnail_task = register_tasks(celery)
     
     # Store task references for access by services
     app.generate_poster_task = generate_poster_task
     app.generate_batch_posters_task = generate_batch_posters_task
+    app.generate_thumbnail_task = generate_thumbnail_task
+    
+    # Build page format lookup tables from the static format config
+    from app.utils.format_helpers import init_format_helpers
+    init_format_helpers(app)
+    
+    # Preload themes once and share the service across requests
+    from app.services.theme_service import ThemeService
+    with app.app_context():
+        app.extensions['theme_service'] = ThemeService(app.config['THEMES_DIR'])
     
     # Register blueprints
     from app.api import register_blueprints
@@ -132,6 +149,11 @@ def create_app(config_class=Config):
     from app.web import web_bp
     app.register_blueprint(web_bp)
     
+    # Compile page templates up front so the first request after a restart
+    # does not pay for it
+    for template_name in ('index.html', 'create.html', 'themes.html', 'gallery.html', 'result.html'):
+        app.jinja_env.get_template(template_name)
+    
     # Create database tables
     with app.app_context():
         db.create_all()
@@ -4,6 +4,7 @@ from flask import jsonify, current_app
 from app.api import api_v1
 from app.extensions import db, get_redis_client
 from datetime import datetime
+import os
 
 
 @api_v1.route('/health', methods=['GET'])
@@ -49,7 +50,6 @@ def health_check():
         overall_status = 'degraded'
     
     # Check storage
-    import os
     try:
         storage_path = current_app.config['POSTER_STORAGE_PATH']
         if os.path.exists(storage_path) and os.access(storage_path, os.W_OK):
@@ -1,11 +1,18 @@
 """Job status API endpoints."""
 
-from flask import jsonify, current_app
+import json
+import redis
+from flask import Response, jsonify, request, current_app, stream_with_context
 from app.api import api_v1
-from app.services.poster_service import PosterService
+from app.extensions import get_redis_client
+from app.services.poster_service import FINAL_STATUSES, JOB_PROGRESS_CHANNEL, PosterService
 
+# Seconds without a progress message before the event stream sends a
+# keep-alive and re-checks whether the job has finished
+EVENT_STREAM_IDLE_TIMEOUT = 5
 
-@api_v1.route('/jobs/<job_id>', methods=['GET'])
+
+@api_v1.route('/jobs/<uuid:job_id>', methods=['GET'])
 def get_job_status(job_id):
     """
     Get job status and progress.
@@ -14,8 +21,9 @@ def get_job_status(job_id):
         job_id: Job UUID
         
     Returns:
-        JSON response with job status details
+        JSON response with job status details (304 if the client's ETag matches)
     """
+    job_id = str(job_id)
     try:
         poster_service = PosterService()
         status = poster_service.get_job_status(job_id)
@@ -26,7 +34,10 @@ def get_job_status(job_id):
                 'message': f"Job '{job_id}' does not exist"
             }), 404
         
-        return jsonify(status), 200
+        # ETag lets polling clients receive 304 Not Modified when nothing changed
+        response = jsonify(status)
+        response.add_etag()
+        return response.make_conditional(request)
         
     except Exception as e:
         current_app.logger.error(f"Error fetching job status {job_id}: {e}")
@@ -36,7 +47,108 @@ def get_job_status(job_id):
         }), 500
 
 
-@api_v1.route('/jobs/<job_id>/cancel', methods=['POST'])
+@api_v1.route('/jobs/<uuid:job_id>/events', methods=['GET'])
+def stream_job_progress(job_id):
+    """
+    Stream live job progress as Server-Sent Events.
+    
+    Sends the current status first, then every progress update published by
+    the worker, and closes with a final status event once the job finishes
+    or Redis becomes unavailable.
+    
+    Args:
+        job_id: Job UUID
+        
+    Returns:
+        text/event-stream response
+    """
+    job_id = str(job_id)
+    poster_service = PosterService()
+    status = poster_service.get_job_status(job_id)
+    
+    if not status:
+        return jsonify({
+            'error': 'Job not found',
+            'message': f"Job '{job_id}' does not exist"
+        }), 404
+    
+    @stream_with_context
+    def generate():
+        yield f"event: status\ndata: {json.dumps(status)}\n\n"
+        if status['status'] in FINAL_STATUSES:
+            return
+        
+        pubsub = None
+        try:
+            pubsub = get_redis_client(current_app).pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(JOB_PROGRESS_CHANNEL.format(job_id=job_id))
+            while True:
+                message = pubsub.get_message(timeout=EVENT_STREAM_IDLE_TIMEOUT)
+                if message:
+                    entry = message['data'].decode()
+                    if not json.loads(entry).get('final'):
+                        yield f"data: {entry}\n\n"
+                        continue
+                
+                # Idle or told the job finished: stop once it has a final status
+                current = poster_service.get_job_status(job_id)
+                if not current or current['status'] in FINAL_STATUSES:
+                    if current:
+                        yield f"event: status\ndata: {json.dumps(current)}\n\n"
+                    return
+                yield ": keep-alive\n\n"
+        except redis.RedisError as e:
+            # No live updates without Redis; end with the latest stored
+            # status so the client can fall back to polling
+            current_app.logger.warning(f"Progress stream for job {job_id} lost Redis: {e}")
+            current = poster_service.get_job_status(job_id)
+            if current:
+                yield f"event: status\ndata: {json.dumps(current)}\n\n"
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+@api_v1.route('/batches/<uuid:batch_id>/status', methods=['GET'])
+def get_batch_jobs_status(batch_id):
+    """
+    Get status and progress of every job in a batch in one request.
+    
+    Args:
+        batch_id: Batch UUID
+        
+    Returns:
+        JSON response with per-job statuses (304 if the client's ETag matches)
+    """
+    batch_id = str(batch_id)
+    try:
+        poster_service = PosterService()
+        status = poster_service.get_batch_status(batch_id)
+        
+        if not status:
+            return jsonify({
+                'error': 'Batch not found',
+                'message': f"Batch '{batch_id}' does not exist"
+            }), 404
+        
+        response = jsonify(status)
+        response.add_etag()
+        return response.make_conditional(request)
+        
+    except Exception as e:
+        current_app.logger.error(f"Error fetching batch status {batch_id}: {e}")
+        return jsonify({
+            'error': 'Internal server error',
+            'message': 'Failed to fetch batch status'
+        }), 500
+
+
+@api_v1.route('/jobs/<uuid:job_id>/cancel', methods=['POST'])
 def cancel_job(job_id):
     """
     Cancel a pending or running job.
@@ -47,6 +159,7 @@ def cancel_job(job_id):
     Returns:
         JSON response with cancellation status
     """
+    job_id = str(job_id)
     try:
         poster_service = PosterService()
         success = poster_service.cancel_job(job_id)
@@ -2,13 +2,16 @@
 
 from flask import jsonify, request, current_app, send_file, session
 from app.api import api_v1
-from app.services.poster_service import PosterService
-from app.services.theme_service import ThemeService
+from app.services.poster_service import PosterService, invalidate_poster_view_cache
+from app.services.theme_service import current_theme_service
 from app.services.geocoding_service import GeocodingService
-from app.models import Poster
-from app.extensions import db
+from app.models import Job, Poster
 from app.utils.format_helpers import get_format_dimensions, validate_dpi
+from datetime import datetime
+import io
 import os
+import uuid
+import zipfile
 
 
 def validate_format_parameters(data: dict) -> dict:
@@ -119,7 +122,7 @@ def create_poster():
             }), 400
         
         # Validate theme exists
-        theme_service = ThemeService()
+        theme_service = current_theme_service._get_current_object()
         if not theme_service.validate_theme_exists(theme):
             available = [t['id'] for t in theme_service.get_all_themes()]
             return jsonify({
@@ -175,7 +178,6 @@ def create_poster():
         
         # Get or create session ID
         if 'session_id' not in session:
-            import uuid
             session['session_id'] = str(uuid.uuid4())
         session_id = session['session_id']
         
@@ -208,7 +210,7 @@ def create_poster():
         }), 500
 
 
-@api_v1.route('/posters/<poster_id>', methods=['GET'])
+@api_v1.route('/posters/<uuid:poster_id>', methods=['GET'])
 def get_poster(poster_id):
     """
     Get poster details.
@@ -219,6 +221,7 @@ def get_poster(poster_id):
     Returns:
         JSON response with poster details
     """
+    poster_id = str(poster_id)
     try:
         poster = Poster.query.get(poster_id)
         
@@ -240,7 +243,7 @@ def get_poster(poster_id):
         }), 500
 
 
-@api_v1.route('/posters/<poster_id>/image', methods=['GET'])
+@api_v1.route('/posters/<uuid:poster_id>/image', methods=['GET'])
 def get_poster_image(poster_id):
     """
     Get poster image for display (inline, not as attachment).
@@ -251,6 +254,7 @@ def get_poster_image(poster_id):
     Returns:
         PNG file inline
     """
+    poster_id = str(poster_id)
     try:
         poster = Poster.query.get(poster_id)
         
@@ -280,7 +284,7 @@ def get_poster_image(poster_id):
         }), 500
 
 
-@api_v1.route('/posters/<poster_id>/download', methods=['GET'])
+@api_v1.route('/posters/<uuid:poster_id>/download', methods=['GET'])
 def download_poster(poster_id):
     """
     Download full-resolution poster file.
@@ -291,6 +295,7 @@ def download_poster(poster_id):
     Returns:
         PNG file as attachment
     """
+    poster_id = str(poster_id)
     try:
         poster = Poster.query.get(poster_id)
         
@@ -308,6 +313,7 @@ def download_poster(poster_id):
             }), 404
         
         poster.increment_download_count()
+        invalidate_poster_view_cache(poster.id)
         
         return send_file(
             poster.file_path,
@@ -434,7 +440,8 @@ def create_batch_posters():
             "themes": ["noir", "midnight_blue", "pastel_dream"],
             "total_themes": 3,
             "created_at": "2026-01-20T17:00:00Z",
-            "estimated_duration": 90
+            "estimated_duration": 90,
+            "batch_status_url": "/api/v1/batches/batch_uuid/status"
         }
     """
     try:
@@ -465,7 +472,7 @@ def create_batch_posters():
             }), 400
         
         # Validate that all themes exist
-        theme_service = ThemeService()
+        theme_service = current_theme_service._get_current_object()
         available_themes = [t['id'] for t in theme_service.get_all_themes()]
         
         invalid_themes = [t for t in themes if t not in available_themes]
@@ -524,7 +531,6 @@ def create_batch_posters():
         
         # Get or create session ID
         if 'session_id' not in session:
-            import uuid
             session['session_id'] = str(uuid.uuid4())
         session_id = session['session_id']
         
@@ -557,7 +563,7 @@ def create_batch_posters():
         }), 500
 
 
-@api_v1.route('/posters/batch/<batch_id>/status', methods=['GET'])
+@api_v1.route('/posters/batch/<uuid:batch_id>/status', methods=['GET'])
 def get_batch_status(batch_id):
     """
     Get the status of a batch poster generation job.
@@ -568,10 +574,8 @@ def get_batch_status(batch_id):
     Returns:
         JSON response with batch status and individual job statuses
     """
+    batch_id = str(batch_id)
     try:
-        from app.models import Job
-        from app.extensions import db
-        
         current_app.logger.debug(f"Fetching batch status for batch_id: {batch_id}")
         
         # Get all jobs for this batch
@@ -617,7 +621,7 @@ def get_batch_status(batch_id):
         }), 500
 
 
-@api_v1.route('/posters/batch/<batch_id>/download', methods=['GET'])
+@api_v1.route('/posters/batch/<uuid:batch_id>/download', methods=['GET'])
 def download_batch_posters(batch_id):
     """
     Download all posters from a batch as a ZIP file.
@@ -628,12 +632,8 @@ def download_batch_posters(batch_id):
     Returns:
         ZIP file containing all completed posters
     """
+    batch_id = str(batch_id)
     try:
-        from app.models import Job
-        import zipfile
-        import io
-        from datetime import datetime
-        
         # Get all completed jobs for this batch
         jobs = Job.query.filter_by(batch_id=batch_id, status='completed').all()
         
@@ -2,7 +2,7 @@
 
 from flask import jsonify, current_app
 from app.api import api_v1
-from app.services.theme_service import ThemeService
+from app.services.theme_service import current_theme_service
 
 
 @api_v1.route('/themes', methods=['GET'])
@@ -14,7 +14,7 @@ def get_themes():
         JSON response with list of themes
     """
     try:
-        theme_service = ThemeService()
+        theme_service = current_theme_service._get_current_object()
         themes = theme_service.get_all_themes()
         
         return jsonify({
@@ -42,7 +42,7 @@ def get_theme(theme_id):
         JSON response with theme details
     """
     try:
-        theme_service = ThemeService()
+        theme_service = current_theme_service._get_current_object()
         theme = theme_service.get_theme(theme_id)
         
         if not theme:
@@ -26,6 +26,10 @@ class Config:
     # Celery
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or 'redis://localhost:6379/1'
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND') or 'redis://localhost:6379/2'
+    # Recycle prefork children so matplotlib/osmnx memory does not pile up
+    CELERY_WORKER_MAX_TASKS_PER_CHILD = int(os.environ.get('CELERY_WORKER_MAX_TASKS_PER_CHILD', 20))
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD = int(os.environ.get('CELERY_WORKER_MAX_MEMORY_PER_CHILD', 1_500_000))  # KB
+    CELERY_WORKER_CONCURRENCY = int(os.environ.get('CELERY_WORKER_CONCURRENCY', 2))
     
     # Cache
     CACHE_TYPE = 'redis'
@@ -36,6 +40,7 @@ class Config:
     POSTER_STORAGE_PATH = os.environ.get('POSTER_STORAGE_PATH') or str(BASE_DIR / 'posters')
     THUMBNAIL_STORAGE_PATH = os.environ.get('THUMBNAIL_STORAGE_PATH') or str(BASE_DIR / 'thumbnails')
     TEMP_STORAGE_PATH = os.environ.get('TEMP_STORAGE_PATH') or str(BASE_DIR / 'temp')
+    THEMES_DIR = os.environ.get('THEMES_DIR') or str(BASE_DIR / 'themes')
     
     # Poster Generation
     MAX_DISTANCE = 50000  # meters
@@ -155,6 +160,10 @@ class Config:
     DEFAULT_DPI = 300
     DEFAULT_ORIENTATION = 'portrait'
     
+    # Error reporting: store full tracebacks on failed jobs (None = only in
+    # debug mode); otherwise only the id they were logged under is stored
+    STORE_TRACEBACKS = None
+    
     # Rate Limiting
     GEOCODING_RATE_LIMIT = 10  # requests per minute
     API_RATE_LIMIT = 100  # requests per minute
@@ -3,9 +3,15 @@
 from enum import Enum
 from datetime import datetime
 import uuid
+from sqlalchemy.dialects import postgresql
 from app.extensions import db
 
 
+# UUID stored natively (16 bytes) on PostgreSQL and as a 36-char string
+# elsewhere; Python code always sees the canonical string form
+UUIDString = db.String(36).with_variant(postgresql.UUID(as_uuid=False), 'postgresql')
+
+
 class JobStatus(Enum):
     """Job status enumeration."""
     PENDING = 'pending'
@@ -19,9 +25,13 @@ class Job(db.Model):
     """Job model for poster generation tasks."""
     
     __tablename__ = 'jobs'
+    __table_args__ = (
+        # Batch status/download lookups filter on batch_id and status together
+        db.Index('ix_jobs_batch_id_status', 'batch_id', 'status'),
+    )
     
     # Primary key
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Request parameters
     city = db.Column(db.String(100), nullable=False)
@@ -40,7 +50,7 @@ class Job(db.Model):
     custom_height_inches = db.Column(db.Float, nullable=True)
     
     # Job status
-    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING, index=True)
+    status = db.Column(db.Enum(JobStatus), nullable=False, default=JobStatus.PENDING, server_default=JobStatus.PENDING.name, index=True)
     progress = db.Column(db.Integer, default=0)
     current_step = db.Column(db.String(200))
     progress_steps = db.Column(db.JSON, default=list)  # Array of completed steps with status
@@ -48,10 +58,10 @@ class Job(db.Model):
     # User/session tracking
     session_id = db.Column(db.String(100), index=True)
     user_id = db.Column(db.Integer, index=True)  # For future use
-    batch_id = db.Column(db.String(36), nullable=True, index=True)  # UUID for batch grouping
+    batch_id = db.Column(UUIDString, nullable=True, index=True)  # UUID for batch grouping
     
-    # Timestamps
-    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    # Timestamps (created_at is filled in by the database so INSERTs can omit it)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.func.now(), index=True)
     started_at = db.Column(db.DateTime)
     completed_at = db.Column(db.DateTime)
     failed_at = db.Column(db.DateTime)
@@ -121,12 +131,16 @@ class Poster(db.Model):
     """Poster model for generated poster metadata."""
     
     __tablename__ = 'posters'
+    __table_args__ = (
+        # Gallery pages walk a session's posters newest first
+        db.Index('ix_posters_session_id_created_at', 'session_id', 'created_at'),
+    )
     
     # Primary key
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign key to Job
-    job_id = db.Column(db.String(36), db.ForeignKey('jobs.id'), nullable=False, unique=True)
+    job_id = db.Column(UUIDString, db.ForeignKey('jobs.id'), nullable=False, unique=True)
     
     # Location and theme info
     city = db.Column(db.String(100), nullable=False, index=True)
@@ -10,23 +10,31 @@ All functions use the app's logging system for consistent logging.
 
 import os
 import json
+import pickle
+import threading
 import time
 import logging
 from datetime import datetime
 from functools import lru_cache
-from typing import Dict, Tuple, Optional, Callable, List
+from typing import BinaryIO, Dict, Tuple, Optional, Callable, List, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import osmnx as ox
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend for thread safety
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.font_manager import FontProperties
 from matplotlib.textpath import TextPath
 import matplotlib.colors as mcolors
 import numpy as np
 from geopy.geocoders import Nominatim
 
+try:
+    from cachetools import TTLCache
+except ImportError:  # pragma: no cover - cachetools is optional
+    TTLCache = None
+
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
@@ -35,6 +43,42 @@ THEMES_DIR = "themes"
 FONTS_DIR = "fonts"
 POSTERS_DIR = "posters"
 
+# Filename slugs replace spaces in one pass
+_SLUG_TABLE = str.maketrans(' ', '_')
+
+# Map data cache: every theme of a batch renders the same area. Entries are
+# kept in process (small, since each holds a full street graph) and shared
+# between workers through Redis
+MAP_DATA_CACHE_KEY = 'map:{lat:.4f}:{lon:.4f}:{distance}'
+MAP_DATA_CACHE_TTL = 3600  # seconds
+MAP_DATA_MEMORY_CACHE_SIZE = 4
+
+_map_data_memory_cache = TTLCache(MAP_DATA_MEMORY_CACHE_SIZE, ttl=MAP_DATA_CACHE_TTL) if TTLCache else None
+_map_data_memory_lock = threading.Lock()
+
+# Single background writer so pickling and uploading map data to Redis
+# overlaps with rendering instead of delaying it
+_map_data_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='map-cache-store')
+
+# Road hierarchy: highway type -> (theme color key, line width); any
+# other type is drawn with DEFAULT_ROAD_STYLE
+ROAD_STYLES = {
+    'motorway': ('road_motorway', 1.2),
+    'motorway_link': ('road_motorway', 1.2),
+    'trunk': ('road_primary', 1.0),
+    'trunk_link': ('road_primary', 1.0),
+    'primary': ('road_primary', 1.0),
+    'primary_link': ('road_primary', 1.0),
+    'secondary': ('road_secondary', 0.8),
+    'secondary_link': ('road_secondary', 0.8),
+    'tertiary': ('road_tertiary', 0.6),
+    'tertiary_link': ('road_tertiary', 0.6),
+    'residential': ('road_residential', 0.4),
+    'living_street': ('road_residential', 0.4),
+    'unclassified': ('road_residential', 0.4),
+}
+DEFAULT_ROAD_STYLE = ('road_default', 0.4)
+
 
 def load_fonts():
     """
@@ -75,7 +119,7 @@ def generate_output_filename(city: str, theme_name: str, extension: str = 'png')
         os.makedirs(POSTERS_DIR)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    city_slug = city.lower().replace(' ', '_')
+    city_slug = city.translate(_SLUG_TABLE).lower()
     filename = f"{city_slug}_{theme_name}_{timestamp}.{extension}"
     return os.path.join(POSTERS_DIR, filename)
 
@@ -237,21 +281,19 @@ def create_gradient_fade(ax, color: str, location: str = 'bottom', zorder: int =
         location: 'bottom' or 'top'
         zorder: Z-order for layering
     """
-    vals = np.linspace(0, 1, 256).reshape(-1, 1)
-    gradient = np.hstack((vals, vals))
+    # A single column is enough; imshow stretches it across the extent
+    ramp = np.linspace(0, 1, 256)
+    gradient = ramp.reshape(-1, 1)
     
-    rgb = mcolors.to_rgb(color)
-    my_colors = np.zeros((256, 4))
-    my_colors[:, 0] = rgb[0]
-    my_colors[:, 1] = rgb[1]
-    my_colors[:, 2] = rgb[2]
+    my_colors = np.empty((256, 4))
+    my_colors[:, :3] = mcolors.to_rgb(color)
     
     if location == 'bottom':
-        my_colors[:, 3] = np.linspace(1, 0, 256)
+        my_colors[:, 3] = ramp[::-1]
         extent_y_start = 0
         extent_y_end = 0.25
     else:
-        my_colors[:, 3] = np.linspace(0, 1, 256)
+        my_colors[:, 3] = ramp
         extent_y_start = 0.75
         extent_y_end = 1.0
 
@@ -281,37 +323,19 @@ def get_edge_attributes_by_type(G, theme: Dict) -> Tuple[List[str], List[float]]
     Returns:
         Tuple of (edge_colors, edge_widths)
     """
+    # Resolve the theme's colors once; each edge is then one dict lookup
+    styles = {highway: (theme[color_key], width) for highway, (color_key, width) in ROAD_STYLES.items()}
+    default_style = (theme[DEFAULT_ROAD_STYLE[0]], DEFAULT_ROAD_STYLE[1])
+    
     edge_colors = []
     edge_widths = []
     
-    for u, v, data in G.edges(data=True):
-        # Get the highway type (can be a list or string)
-        highway = data.get('highway', 'unclassified')
-        
-        # Handle list of highway types (take the first one)
-        if isinstance(highway, list):
+    for _, _, highway in G.edges(data='highway', default='unclassified'):
+        # A list of highway types: take the first one
+        if type(highway) is list:
             highway = highway[0] if highway else 'unclassified'
         
-        # Assign color and width based on road type
-        if highway in ['motorway', 'motorway_link']:
-            color = theme['road_motorway']
-            width = 1.2
-        elif highway in ['trunk', 'trunk_link', 'primary', 'primary_link']:
-            color = theme['road_primary']
-            width = 1.0
-        elif highway in ['secondary', 'secondary_link']:
-            color = theme['road_secondary']
-            width = 0.8
-        elif highway in ['tertiary', 'tertiary_link']:
-            color = theme['road_tertiary']
-            width = 0.6
-        elif highway in ['residential', 'living_street', 'unclassified']:
-            color = theme['road_residential']
-            width = 0.4
-        else:
-            color = theme['road_default']
-            width = 0.4
-        
+        color, width = styles.get(highway, default_style)
         edge_colors.append(color)
         edge_widths.append(width)
     
@@ -435,9 +459,10 @@ def fetch_map_data(point: Tuple[float, float], distance: int,
             if progress_callback:
                 progress_callback(data_type, completed, total)
     
-    # Get bounds from graph
-    nodes = ox.graph_to_gdfs(map_data['graph'], edges=False)
-    map_data['bounds'] = (nodes.x.min(), nodes.x.max(), nodes.y.min(), nodes.y.max())
+    # Get bounds from the node coordinates directly; graph_to_gdfs would
+    # build a Point geometry for every node just to take four extremes
+    node_xy = np.array([(d['x'], d['y']) for _, d in map_data['graph'].nodes(data=True)])
+    map_data['bounds'] = (node_xy[:, 0].min(), node_xy[:, 0].max(), node_xy[:, 1].min(), node_xy[:, 1].max())
     
     # Single rate limiting sleep after all downloads complete
     time.sleep(0.5)
@@ -446,26 +471,112 @@ def fetch_map_data(point: Tuple[float, float], distance: int,
     return map_data
 
 
+def _store_map_data(redis_client, cache_key: str, map_data: Dict) -> None:
+    """Write map data to the shared Redis cache."""
+    try:
+        redis_client.setex(cache_key, MAP_DATA_CACHE_TTL, pickle.dumps(map_data, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception as e:
+        logger.warning(f"Map data cache write failed: {e}")
+
+
+def fetch_map_data_cached(point: Tuple[float, float], distance: int, redis_client=None,
+                          progress_callback: Optional[Callable] = None,
+                          store_async: bool = True) -> Dict:
+    """
+    Fetch map data through the in-process cache, then Redis, then OSM.
+    
+    The cache key quantizes the point to 4 decimal places (~11 m). On a hit
+    the progress callback still receives one call per data type so callers
+    report the same steps either way. The returned data is shared between
+    callers and must be treated as read-only.
+    
+    Args:
+        point: Tuple of (latitude, longitude)
+        distance: Distance in meters for the bounding box
+        redis_client: Redis client used as the shared cache; None disables it
+        progress_callback: Optional callback function(step_name, completed, total)
+        store_async: Write a freshly fetched result to Redis in the background;
+                     pass False when other workers must find it immediately
+        
+    Returns:
+        Map data dictionary as returned by fetch_map_data()
+    """
+    memory_key = (round(point[0], 4), round(point[1], 4), distance)
+    cache_key = MAP_DATA_CACHE_KEY.format(lat=memory_key[0], lon=memory_key[1], distance=distance)
+    
+    def _report_cached_steps():
+        if progress_callback:
+            data_types = ('streets', 'water', 'parks')
+            for completed, data_type in enumerate(data_types, start=1):
+                progress_callback(data_type, completed, len(data_types))
+    
+    if _map_data_memory_cache is not None:
+        with _map_data_memory_lock:
+            map_data = _map_data_memory_cache.get(memory_key)
+        if map_data is not None:
+            logger.info(f"Map data memory cache hit for {cache_key}")
+            _report_cached_steps()
+            return map_data
+    
+    map_data = None
+    if redis_client is not None:
+        try:
+            cached = redis_client.get(cache_key)
+            if cached:
+                # Pickle is required for the networkx graph; the cache is only
+                # written by our own workers
+                map_data = pickle.loads(cached)
+                logger.info(f"Map data cache hit for {cache_key}")
+                _report_cached_steps()
+        except Exception as e:
+            logger.warning(f"Map data cache read failed: {e}")
+    
+    if map_data is None:
+        map_data = fetch_map_data(point, distance, progress_callback=progress_callback)
+        if redis_client is not None:
+            if store_async:
+                _map_data_store_executor.submit(_store_map_data, redis_client, cache_key, map_data)
+            else:
+                _store_map_data(redis_client, cache_key, map_data)
+    
+    if _map_data_memory_cache is not None:
+        with _map_data_memory_lock:
+            _map_data_memory_cache[memory_key] = map_data
+    
+    return map_data
+
+
 def render_poster(map_data: Dict, theme: Dict, city: str, country: str,
-                 point: Tuple[float, float], output_file: str,
+                 point: Tuple[float, float], output_file: Union[str, BinaryIO],
                  width_inches: float, height_inches: float, dpi: int,
                  progress_callback: Optional[Callable] = None,
-                 output_format: str = 'png'):
+                 output_format: str = 'png',
+                 fig: Optional[Figure] = None) -> Dict:
     """
     Render a map poster using pre-fetched map data.
     
+    When ``fig`` is given it is cleared and drawn into instead of creating a
+    new pyplot figure, and it is left open (cleared again) after saving so the
+    caller can reuse it and its Agg render buffer for the next poster.
+    
     Args:
         map_data: Dictionary containing 'graph', 'water', 'parks', 'bounds' from fetch_map_data()
         theme: Theme dictionary with color and style settings
         city: City name for the poster text
         country: Country name for the poster text
         point: Tuple of (latitude, longitude)
-        output_file: Path where the poster will be saved
+        output_file: Path where the poster will be saved, or a binary file
+                     object to encode into (the caller writes it out)
         width_inches: Width of the poster in inches
         height_inches: Height of the poster in inches
         dpi: DPI resolution for output
         progress_callback: Optional callback function(stage_name) called at rendering stages
         output_format: Output format ('png' or 'pdf', default 'png')
+        fig: Optional reusable figure to draw into
+        
+    Returns:
+        Dictionary with the rendered 'width' and 'height' in pixels and the
+        output 'file_size' in bytes (None if the file was not written)
     """
     logger.info(f"Rendering map for {city}, {country}...")
     logger.info(f"Theme: {theme.get('name', 'Unknown')}")
@@ -487,7 +598,15 @@ def render_poster(map_data: Dict, theme: Dict, city: str, country: str,
     if progress_callback:
         progress_callback("initializing")
     
-    fig, ax = plt.subplots(figsize=(width_inches, height_inches), facecolor=theme['bg'])
+    if fig is None:
+        fig, ax = plt.subplots(figsize=(width_inches, height_inches), facecolor=theme['bg'])
+        owns_figure = True
+    else:
+        fig.clf()
+        fig.set_size_inches(width_inches, height_inches)
+        fig.set_facecolor(theme['bg'])
+        ax = fig.add_subplot()
+        owns_figure = False
     ax.set_facecolor(theme['bg'])
     ax.set_position([0, 0, 1, 1])
     
@@ -614,21 +733,37 @@ def render_poster(map_data: Dict, theme: Dict, city: str, country: str,
     
     # Save based on format
     if output_format.lower() == 'pdf':
-        plt.savefig(output_file, format='pdf', dpi=dpi, facecolor=theme['bg'],
-                   bbox_inches='tight', pad_inches=0)
+        fig.savefig(output_file, format='pdf', dpi=dpi, facecolor=theme['bg'],
+                    bbox_inches='tight', pad_inches=0)
         logger.info(f"Done! PDF poster saved as {output_file}")
     else:
-        plt.savefig(output_file, dpi=dpi, facecolor=theme['bg'])
+        # A path picks its format from the extension; a buffer has none
+        fig.savefig(output_file, format=None if isinstance(output_file, str) else 'png',
+                    dpi=dpi, facecolor=theme['bg'])
         logger.info(f"Done! PNG poster saved as {output_file}")
     
-    plt.close()
+    if owns_figure:
+        plt.close(fig)
+    else:
+        fig.clf()
     
     # Verify file was created and get size
-    if os.path.exists(output_file):
-        file_size = os.path.getsize(output_file)
-        logger.info(f"File verified: {file_size / 1024 / 1024:.2f} MB")
+    if not isinstance(output_file, str):
+        file_size = output_file.tell()
     else:
-        logger.warning(f"WARNING: File not found after save: {output_file}")
+        try:
+            file_size = os.stat(output_file).st_size
+            logger.info(f"File verified: {file_size / 1024 / 1024:.2f} MB")
+        except FileNotFoundError:
+            file_size = None
+            logger.warning(f"WARNING: File not found after save: {output_file}")
+    
+    # Agg truncates the figure size in pixels the same way
+    return {
+        'width': int(width_inches * dpi),
+        'height': int(height_inches * dpi),
+        'file_size': file_size
+    }
 
 
 def create_poster(city: str, country: str, point: Tuple[float, float], 
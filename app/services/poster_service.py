@@ -1,16 +1,281 @@
 """Poster service for managing poster generation."""
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+import atexit
+import json
+import logging
+import os
+import time
+import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import current_app
+from flask import after_this_request, current_app, has_request_context
 from app.models import Job, JobStatus, Poster
-from app.extensions import db
+from app.extensions import db, get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+# Shared worker pool for running tasks in eager mode (development) without
+# blocking the HTTP response or spawning a new thread per request
+_EAGER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('EAGER_POOL', 8)),
+    thread_name_prefix='poster-eager'
+)
+atexit.register(_EAGER_EXECUTOR.shutdown, wait=False)
+
+# Job status cache: short TTL while a job is running so polls see fresh
+# progress, long TTL once the job has reached a final state
+JOB_STATUS_CACHE_KEY = 'job:{job_id}:status'
+ACTIVE_STATUS_TTL = 2  # seconds
+FINAL_STATUS_TTL = 3600  # seconds
+FINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value}
+
+# Live progress is published on a per-job Redis channel and kept in a short
+# history list; the database only receives debounced snapshots
+JOB_PROGRESS_CHANNEL = 'job:{job_id}:progress'
+JOB_PROGRESS_HISTORY_KEY = 'job:{job_id}:progress:history'
+PROGRESS_HISTORY_LENGTH = 50
+PROGRESS_HISTORY_TTL = 3600  # seconds
+
+# Aggregate batch status is polled by every client watching a batch; a
+# one-second TTL collapses concurrent polls into a single query
+BATCH_STATUS_CACHE_KEY = 'batch:{batch_id}:status'
+BATCH_STATUS_TTL = 1  # seconds
+
+# Poster detail page data; posters are immutable apart from their download
+# counter, which the download route invalidates
+POSTER_VIEW_CACHE_KEY = 'poster:{poster_id}:view'
+POSTER_VIEW_TTL = 60  # seconds
+
+
+# Columns read by Job.to_dict() for status polls
+_STATUS_COLUMNS = (
+    Job.id, Job.city, Job.country, Job.theme, Job.distance,
+    Job.latitude, Job.longitude, Job.status, Job.progress,
+    Job.current_step, Job.progress_steps, Job.created_at,
+    Job.started_at, Job.completed_at, Job.failed_at,
+    Job.estimated_completion, Job.error_type, Job.error_message, Job.result
+)
+
+# Poster columns included in a completed job's status payload
+_POSTER_RESULT_COLUMNS = (Poster.id, Poster.filename, Poster.file_size, Poster.width, Poster.height)
+
+# Poster columns read by result.html
+_POSTER_VIEW_COLUMNS = (
+    Poster.id, Poster.city, Poster.country, Poster.theme, Poster.distance,
+    Poster.latitude, Poster.longitude, Poster.width, Poster.height,
+    Poster.file_size, Poster.created_at, Poster.download_count
+)
+
+
+def _generate_uuids(count: int) -> List[str]:
+    """
+    Generate several random (version 4) UUID strings from one urandom call.
+    
+    Args:
+        count: Number of UUIDs to generate
+        
+    Returns:
+        List of canonical UUID strings
+    """
+    raw = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4)) for i in range(count)]
+
+
+def invalidate_job_status_cache(*job_ids: str) -> None:
+    """
+    Drop cached status payloads for the given jobs.
+    
+    Called whenever a job's state changes so the next poll reads the database.
+    
+    Args:
+        *job_ids: Job UUIDs whose cached status should be removed
+    """
+    if not job_ids:
+        return
+    try:
+        redis_client = get_redis_client(current_app)
+        redis_client.delete(*(JOB_STATUS_CACHE_KEY.format(job_id=job_id) for job_id in job_ids))
+    except Exception as e:
+        logger.warning("Failed to invalidate job status cache: %s", e)
+
+
+def invalidate_poster_view_cache(poster_id: str) -> None:
+    """
+    Drop the cached detail page data for a poster.
+    
+    Args:
+        poster_id: Poster UUID
+    """
+    try:
+        redis_client = get_redis_client(current_app)
+        redis_client.delete(POSTER_VIEW_CACHE_KEY.format(poster_id=poster_id))
+    except Exception as e:
+        logger.warning("Failed to invalidate poster view cache: %s", e)
+
+
+def stored_error_traceback(error_id: str) -> str:
+    """
+    Value to store in Job.error_traceback for a failure.
+    
+    Must be called from the ``except`` block handling the failure. The full
+    traceback is formatted and stored only when STORE_TRACEBACKS is enabled
+    (by default in debug mode). Otherwise only the error id is stored;
+    callers log the traceback under that id so it can be looked up.
+    
+    Args:
+        error_id: Id the traceback was logged under
+        
+    Returns:
+        Traceback text or error id
+    """
+    store = current_app.config.get('STORE_TRACEBACKS')
+    if store is None:
+        store = current_app.debug
+    return traceback.format_exc() if store else error_id
+
+
+def publish_job_progress(job_id: str, step: str, progress: int, status: str) -> None:
+    """
+    Publish a progress update for a job through Redis.
+    
+    The entry is sent on the job's progress channel for live subscribers and
+    pushed onto a bounded history list so pollers can read the latest step.
+    
+    Args:
+        job_id: Job UUID
+        step: Current step description
+        progress: Progress percentage (0-100)
+        status: Step status ('completed', 'in_progress' or 'pending')
+    """
+    entry = json.dumps({
+        'job_id': job_id,
+        'step': step,
+        'progress': progress,
+        'status': status,
+        'ts': time.time_ns() // 1_000_000  # Unix epoch milliseconds
+    })
+    history_key = JOB_PROGRESS_HISTORY_KEY.format(job_id=job_id)
+    try:
+        redis_client = get_redis_client(current_app)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.publish(JOB_PROGRESS_CHANNEL.format(job_id=job_id), entry)
+        pipe.lpush(history_key, entry)
+        pipe.ltrim(history_key, 0, PROGRESS_HISTORY_LENGTH - 1)
+        pipe.expire(history_key, PROGRESS_HISTORY_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Failed to publish job progress: %s", e)
+
+
+def publish_job_finished(job_id: str, status: str) -> None:
+    """
+    Tell live subscribers that a job has reached a final status.
+    
+    Call only after the final status is committed, so a subscriber that
+    reads the job back on this message sees it. The message is not added
+    to the progress history, which holds progress steps only.
+    
+    Args:
+        job_id: Job UUID
+        status: Final job status ('completed', 'failed' or 'cancelled')
+    """
+    entry = json.dumps({'job_id': job_id, 'status': status, 'final': True})
+    try:
+        get_redis_client(current_app).publish(JOB_PROGRESS_CHANNEL.format(job_id=job_id), entry)
+    except Exception as e:
+        logger.warning("Failed to publish job completion: %s", e)
 
 
 class PosterService:
     """Service for poster generation operations."""
     
+    def _bulk_enqueue(self, task, messages: List[Tuple[list, str]], countdown: int = 1) -> None:
+        """
+        Publish several task messages over a single broker connection.
+        
+        All messages share one producer acquired from Celery's pool, so the
+        connection and channel are set up once instead of per message.
+        
+        Args:
+            task: Celery task to enqueue
+            messages: List of (args, task_id) tuples
+            countdown: Delay in seconds before the tasks may run
+        """
+        celery = current_app.extensions['celery']
+        with celery.producer_or_acquire() as producer:
+            for args, task_id in messages:
+                task.apply_async(
+                    args=args,
+                    task_id=task_id,
+                    countdown=countdown,
+                    producer=producer
+                )
+    
+    def _async_commit(self) -> None:
+        """
+        Let the current transaction commit without waiting for WAL fsync.
+        
+        PostgreSQL only (SET LOCAL synchronous_commit = off); a no-op on other
+        databases. A crash can lose the last few hundred milliseconds of
+        committed job rows. The worker then fails to find the job and gives
+        up, which is an acceptable trade for not paying an fsync on every
+        poster request.
+        """
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(db.text("SET LOCAL synchronous_commit = off"))
+    
+    def _submit_eager(self, run_task) -> None:
+        """
+        Hand an eager-mode task to the worker pool once the response is sent.
+        
+        Inside a request the submission is deferred with after_this_request,
+        so the HTTP response is never delayed by the task starting.
+        
+        Args:
+            run_task: Callable that runs the task in its own app context
+        """
+        if not has_request_context():
+            _EAGER_EXECUTOR.submit(run_task)
+            return
+        
+        @after_this_request
+        def _launch(response):
+            _EAGER_EXECUTOR.submit(run_task)
+            return response
+    
+    def _mark_jobs_failed(
+        self,
+        job_ids: List[str],
+        error_type: str,
+        error_message: str,
+        error_traceback: Optional[str] = None
+    ) -> None:
+        """
+        Mark jobs as FAILED with a single UPDATE statement and commit.
+        
+        Args:
+            job_ids: Job UUIDs to update
+            error_type: Error class name or category
+            error_message: Human-readable error message
+            error_traceback: Optional formatted traceback
+        """
+        db.session.execute(
+            db.update(Job)
+            .where(Job.id.in_(job_ids))
+            .values(
+                status=JobStatus.FAILED,
+                failed_at=datetime.utcnow(),
+                error_type=error_type,
+                error_message=error_message,
+                error_traceback=error_traceback
+            )
+        )
+        db.session.commit()
+        invalidate_job_status_cache(*job_ids)
+    
     def create_poster_job(
         self,
         city: str,
@@ -48,9 +313,12 @@ class PosterService:
         Returns:
             Dict with job_id, status, estimated_duration, etc.
         """
-        # Create job record
+        # Create job record; created_at is set here so the response reports
+        # the stored value
+        job_id = str(uuid.uuid4())
+        created_at = datetime.utcnow()
         job = Job(
-            id=str(uuid.uuid4()),
+            id=job_id,
             city=city,
             country=country,
             theme=theme,
@@ -65,17 +333,16 @@ class PosterService:
             custom_width_inches=custom_width_inches,
             custom_height_inches=custom_height_inches,
             status=JobStatus.PENDING,
-            created_at=datetime.utcnow()
+            created_at=created_at
         )
         
+        # Commit flushes the row; the id is set client-side and kept in a
+        # local, so the expired instance is never reloaded
         db.session.add(job)
+        self._async_commit()
         db.session.commit()
         
-        # Ensure the job is persisted before queuing
-        db.session.flush()
-        db.session.refresh(job)
-        
-        current_app.logger.info(f"Created job {job.id} for {city}, {country}")
+        logger.info("Created job %s for %s, %s", job_id, city, country)
         
         # Queue Celery task
         try:
@@ -84,58 +351,45 @@ class PosterService:
             # In eager mode (development), run task in background thread
             # to avoid blocking the HTTP response
             if current_app.config.get('CELERY_TASK_ALWAYS_EAGER'):
-                import threading
+                app = current_app._get_current_object()
+                
                 def run_task():
-                    try:
-                        # Small delay to ensure HTTP response returns first
-                        import time
-                        time.sleep(0.1)
-                        generate_poster_task.apply_async(
-                            args=[job.id],
-                            task_id=job.id
-                        )
-                    except Exception as e:
-                        # Catch any exceptions in the background thread
-                        current_app.logger.error(f"Exception in background task for job {job.id}: {e}", exc_info=True)
-                        # Update job status to FAILED
+                    with app.app_context():
                         try:
-                            job_record = Job.query.get(job.id)
-                            if job_record:
-                                job_record.status = JobStatus.FAILED
-                                job_record.failed_at = datetime.utcnow()
-                                job_record.error_type = type(e).__name__
-                                job_record.error_message = str(e)
-                                import traceback
-                                job_record.error_traceback = traceback.format_exc()
-                                db.session.commit()
-                        except Exception as db_error:
-                            current_app.logger.error(f"Failed to update job status: {db_error}")
+                            generate_poster_task.apply_async(
+                                args=[job_id],
+                                task_id=job_id
+                            )
+                        except Exception as e:
+                            # Catch any exceptions in the background thread
+                            error_id = uuid.uuid4().hex
+                            logger.exception("Exception in background task for job %s (error id %s): %s", job_id, error_id, e)
+                            # Update job status to FAILED
+                            try:
+                                self._mark_jobs_failed(
+                                    [job_id], type(e).__name__, str(e),
+                                    error_traceback=stored_error_traceback(error_id)
+                                )
+                            except Exception as db_error:
+                                logger.error("Failed to update job status: %s", db_error)
                 
-                thread = threading.Thread(target=run_task, daemon=True)
-                thread.start()
-                current_app.logger.info(f"Started background thread for job {job.id} (eager mode)")
+                self._submit_eager(run_task)
+                logger.info("Scheduled job %s on eager worker pool", job_id)
             else:
                 # In production, use Celery normally with countdown
-                generate_poster_task.apply_async(
-                    args=[job.id],
-                    task_id=job.id,
-                    countdown=1
-                )
-                current_app.logger.info(f"Queued Celery task for job {job.id}")
+                self._bulk_enqueue(generate_poster_task, [([job_id], job_id)])
+                logger.info("Queued Celery task for job %s", job_id)
         except Exception as e:
-            current_app.logger.error(f"Failed to queue Celery task: {e}")
-            job.status = JobStatus.FAILED
-            job.error_type = 'QueueError'
-            job.error_message = f"Failed to queue task: {str(e)}"
-            db.session.commit()
+            logger.error("Failed to queue Celery task: %s", e)
+            self._mark_jobs_failed([job_id], 'QueueError', f"Failed to queue task: {str(e)}")
             raise
         
         return {
-            'job_id': job.id,
-            'status': job.status.value,
-            'created_at': job.created_at.isoformat() + 'Z',
+            'job_id': job_id,
+            'status': JobStatus.PENDING.value,
+            'created_at': created_at.isoformat() + 'Z',
             'estimated_duration': 15 if preview_mode else 45,
-            'status_url': f'/api/v1/jobs/{job.id}'
+            'status_url': f'/api/v1/jobs/{job_id}'
         }
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
@@ -148,15 +402,46 @@ class PosterService:
         Returns:
             Dict with job status details or None if not found
         """
-        job = Job.query.get(job_id)
+        cache_key = JOB_STATUS_CACHE_KEY.format(job_id=job_id)
+        redis_client = None
+        
+        try:
+            redis_client = get_redis_client(current_app)
+            cached = redis_client.get(cache_key)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("Redis cache error: %s", e)
+            # Continue without cache
+            redis_client = None
+        
+        # Select only the columns the status payload needs instead of loading
+        # the full ORM entity and its poster relationship
+        job = db.session.query(*_STATUS_COLUMNS).filter(Job.id == job_id).first()
         if not job:
             return None
         
-        result = job.to_dict()
+        # Row exposes the same attribute names as Job, so reuse its serializer
+        result = Job.to_dict(job)
         
-        # Add result if completed
-        if job.status == JobStatus.COMPLETED and job.poster:
-            poster = job.poster
+        # Progress is only persisted every few seconds; prefer the latest
+        # published step while the job is still running
+        if redis_client is not None and result['status'] not in FINAL_STATUSES:
+            try:
+                latest = redis_client.lindex(JOB_PROGRESS_HISTORY_KEY.format(job_id=job_id), 0)
+                if latest:
+                    latest = json.loads(latest)
+                    result['progress'] = latest['progress']
+                    result['current_step'] = latest['step']
+            except Exception as e:
+                logger.warning("Failed to read live job progress: %s", e)
+        
+        # Add result if completed (the only case that needs the poster)
+        poster = None
+        if job.status == JobStatus.COMPLETED:
+            poster = db.session.query(*_POSTER_RESULT_COLUMNS).filter(Poster.job_id == job_id).first()
+        
+        if poster:
             result['result'] = {
                 'poster_id': poster.id,
                 'download_url': f'/api/v1/posters/{poster.id}/download',
@@ -170,6 +455,128 @@ class PosterService:
                 }
             }
         
+        if redis_client is not None:
+            ttl = FINAL_STATUS_TTL if result['status'] in FINAL_STATUSES else ACTIVE_STATUS_TTL
+            try:
+                redis_client.setex(cache_key, ttl, json.dumps(result))
+            except Exception as e:
+                logger.warning("Failed to cache job status: %s", e)
+        
+        return result
+    
+    def get_poster_view(self, poster_id: str) -> Optional[Dict]:
+        """
+        Get the fields shown on a poster's detail page.
+        
+        Served from a short-lived Redis entry when possible, so repeat views
+        skip the database and ORM entirely.
+        
+        Args:
+            poster_id: Poster UUID
+            
+        Returns:
+            Dict of poster fields (created_at as a datetime) or None if not found
+        """
+        cache_key = POSTER_VIEW_CACHE_KEY.format(poster_id=poster_id)
+        redis_client = None
+        
+        try:
+            redis_client = get_redis_client(current_app)
+            cached = redis_client.get(cache_key)
+            if cached:
+                view = json.loads(cached)
+                view['created_at'] = datetime.fromisoformat(view['created_at'])
+                return view
+        except Exception as e:
+            logger.warning("Redis cache error: %s", e)
+            redis_client = None
+        
+        poster = db.session.query(*_POSTER_VIEW_COLUMNS).filter(Poster.id == poster_id).first()
+        if not poster:
+            return None
+        
+        view = poster._asdict()
+        
+        if redis_client is not None:
+            try:
+                redis_client.setex(
+                    cache_key, POSTER_VIEW_TTL,
+                    json.dumps({**view, 'created_at': view['created_at'].isoformat()})
+                )
+            except Exception as e:
+                logger.warning("Failed to cache poster view: %s", e)
+        
+        return view
+    
+    def get_batch_status(self, batch_id: str) -> Optional[Dict]:
+        """
+        Get the status of every job in a batch with one query.
+        
+        Args:
+            batch_id: Batch UUID
+            
+        Returns:
+            Dict with batch_id and per-job status entries, or None if not found
+        """
+        cache_key = BATCH_STATUS_CACHE_KEY.format(batch_id=batch_id)
+        redis_client = None
+        
+        try:
+            redis_client = get_redis_client(current_app)
+            cached = redis_client.get(cache_key)
+            if cached:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("Redis cache error: %s", e)
+            redis_client = None
+        
+        # One indexed scan on batch_id; the outer join picks up poster ids
+        # for completed jobs without loading ORM entities
+        rows = db.session.execute(
+            db.select(
+                Job.id, Job.theme, Job.status, Job.progress,
+                Job.current_step, Job.error_message, Poster.id.label('poster_id')
+            )
+            .outerjoin(Poster, Poster.job_id == Job.id)
+            .where(Job.batch_id == batch_id)
+            .order_by(Job.created_at)
+        ).all()
+        if not rows:
+            return None
+        
+        jobs = []
+        for row in rows:
+            job = {
+                'job_id': row.id,
+                'theme': row.theme,
+                'status': row.status.value,
+                'progress': row.progress or 0,
+                'status_url': f'/api/v1/jobs/{row.id}'
+            }
+            if row.current_step:
+                job['current_step'] = row.current_step
+            if row.error_message:
+                job['error_message'] = row.error_message
+            if row.poster_id:
+                job['poster_id'] = row.poster_id
+                job['download_url'] = f'/api/v1/posters/{row.poster_id}/download'
+            jobs.append(job)
+        
+        result = {
+            'batch_id': batch_id,
+            'total': len(jobs),
+            'completed': sum(1 for job in jobs if job['status'] == JobStatus.COMPLETED.value),
+            'failed': sum(1 for job in jobs if job['status'] == JobStatus.FAILED.value),
+            'finished': all(job['status'] in FINAL_STATUSES for job in jobs),
+            'jobs': jobs
+        }
+        
+        if redis_client is not None:
+            try:
+                redis_client.setex(cache_key, BATCH_STATUS_TTL, json.dumps(result))
+            except Exception as e:
+                logger.warning("Failed to cache batch status: %s", e)
+        
         return result
     
     def create_batch_poster_job(
@@ -191,6 +598,11 @@ class PosterService:
         """
         Create a batch poster generation job for multiple themes.
         
+        All job rows are written with one bulk INSERT and one commit, then a
+        single batch task message is published. The batch task fetches the
+        OSM data once into the shared map data cache and fans the themes out
+        to per-job poster tasks.
+        
         Args:
             city: City name
             country: Country name
@@ -209,94 +621,81 @@ class PosterService:
         Returns:
             Dict with batch_id, job_ids, status, themes, etc.
         """
-        # Create a batch ID
-        batch_id = str(uuid.uuid4())
-        job_ids = []
-        
-        # Create individual job records for each theme
-        for theme in themes:
-            job = Job(
-                id=str(uuid.uuid4()),
-                city=city,
-                country=country,
-                theme=theme,
-                distance=distance,
-                latitude=latitude,
-                longitude=longitude,
-                preview_mode=preview_mode,
-                session_id=session_id,
-                batch_id=batch_id,
-                page_format=page_format,
-                orientation=orientation,
-                dpi=dpi,
-                custom_width_inches=custom_width_inches,
-                custom_height_inches=custom_height_inches,
-                status=JobStatus.PENDING,
-                created_at=datetime.utcnow()
-            )
-            
-            db.session.add(job)
-            job_ids.append(job.id)
-        
+        # Create the batch ID and one job ID per theme in a single pass
+        batch_id, *job_ids = _generate_uuids(len(themes) + 1)
+        created_at = datetime.utcnow()
+
+        # Build one row per theme and insert them in a single bulk statement,
+        # skipping per-instance ORM bookkeeping. status and created_at are
+        # explicit so every row stores the created_at the response reports.
+        rows = [
+            {
+                'id': job_id,
+                'city': city,
+                'country': country,
+                'theme': theme,
+                'distance': distance,
+                'latitude': latitude,
+                'longitude': longitude,
+                'preview_mode': preview_mode,
+                'session_id': session_id,
+                'batch_id': batch_id,
+                'page_format': page_format,
+                'orientation': orientation,
+                'dpi': dpi,
+                'custom_width_inches': custom_width_inches,
+                'custom_height_inches': custom_height_inches,
+                'progress_steps': [],
+                'status': JobStatus.PENDING,
+                'created_at': created_at
+            }
+            for job_id, theme in zip(job_ids, themes)
+        ]
+
+        db.session.bulk_insert_mappings(Job, rows)
+        self._async_commit()
         db.session.commit()
+
+        logger.info("Created batch %s with %s jobs for %s, %s", batch_id, len(job_ids), city, country)
         
-        # Ensure all jobs are persisted
-        db.session.flush()
-        
-        current_app.logger.info(f"Created batch {batch_id} with {len(job_ids)} jobs for {city}, {country}")
-        
-        # Queue Celery task for batch generation
+        # Queue one Celery task for the whole batch (one broker publish)
         try:
             # Get the batch task from app
             generate_batch_task = current_app.generate_batch_posters_task
             
             # In eager mode (development), run task in background thread
             if current_app.config.get('CELERY_TASK_ALWAYS_EAGER'):
-                import threading
+                app = current_app._get_current_object()
+                
                 def run_task():
-                    try:
-                        import time
-                        time.sleep(0.1)
-                        generate_batch_task.apply_async(
-                            args=[batch_id, job_ids],
-                            task_id=batch_id
-                        )
-                    except Exception as e:
-                        current_app.logger.error(f"Exception in background batch task: {e}", exc_info=True)
-                        # Update all jobs to FAILED
+                    with app.app_context():
                         try:
-                            for job_id in job_ids:
-                                job_record = Job.query.get(job_id)
-                                if job_record:
-                                    job_record.status = JobStatus.FAILED
-                                    job_record.failed_at = datetime.utcnow()
-                                    job_record.error_type = type(e).__name__
-                                    job_record.error_message = str(e)
-                            db.session.commit()
-                        except Exception as db_error:
-                            current_app.logger.error(f"Failed to update batch job statuses: {db_error}")
+                            generate_batch_task.apply_async(
+                                args=[batch_id, job_ids],
+                                task_id=batch_id
+                            )
+                        except Exception as e:
+                            error_id = uuid.uuid4().hex
+                            logger.exception("Exception in background batch task (error id %s): %s", error_id, e)
+                            # Update all jobs to FAILED
+                            try:
+                                self._mark_jobs_failed(
+                                    job_ids, type(e).__name__, str(e),
+                                    error_traceback=stored_error_traceback(error_id)
+                                )
+                            except Exception as db_error:
+                                logger.error("Failed to update batch job statuses: %s", db_error)
                 
-                thread = threading.Thread(target=run_task, daemon=True)
-                thread.start()
-                current_app.logger.info(f"Started background thread for batch {batch_id} (eager mode)")
+                self._submit_eager(run_task)
+                logger.info("Scheduled batch %s on eager worker pool", batch_id)
             else:
                 # In production, use Celery normally with countdown
-                generate_batch_task.apply_async(
-                    args=[batch_id, job_ids],
-                    task_id=batch_id,
-                    countdown=1
-                )
-                current_app.logger.info(f"Queued Celery batch task {batch_id}")
+                self._bulk_enqueue(generate_batch_task, [([batch_id, job_ids], batch_id)])
+                logger.info("Queued Celery batch task %s", batch_id)
         except Exception as e:
-            current_app.logger.error(f"Failed to queue Celery batch task: {e}")
+            logger.error("Failed to queue Celery batch task: %s", e)
             # Update all jobs to FAILED
-            for job_id in job_ids:
-                job_record = Job.query.get(job_id)
-                if job_record:
-                    job_record.status = JobStatus.FAILED
-                    job_record.error_type = 'QueueError'
-                    job_record.error_message = f"Failed to queue batch task: {str(e)}"
-            db.session.commit()
+            self._mark_jobs_failed(job_ids, 'QueueError', f"Failed to queue batch task: {str(e)}")
             raise
         
         # Calculate estimated duration (slightly less than sum of individual jobs due to parallel rendering)
@@ -309,8 +708,9 @@ class PosterService:
             'status': 'queued',
             'themes': themes,
             'total_themes': len(themes),
-            'created_at': datetime.utcnow().isoformat() + 'Z',
+            'created_at': created_at.isoformat() + 'Z',
             'estimated_duration': estimated_duration,
+            'batch_status_url': f'/api/v1/batches/{batch_id}/status',
             'status_urls': [f'/api/v1/jobs/{job_id}' for job_id in job_ids]
         }
     
@@ -334,16 +734,18 @@ class PosterService:
                 celery = current_app.extensions.get('celery')
                 if celery:
                     celery.control.revoke(job_id, terminate=True)
-                    current_app.logger.info(f"Revoked Celery task for job {job_id}")
+                    logger.info("Revoked Celery task for job %s", job_id)
             except Exception as e:
-                current_app.logger.error(f"Failed to revoke Celery task: {e}")
+                logger.error("Failed to revoke Celery task: %s", e)
             
             # Update job status
             job.status = JobStatus.CANCELLED
             job.failed_at = datetime.utcnow()
             db.session.commit()
+            invalidate_job_status_cache(job_id)
+            publish_job_finished(job_id, JobStatus.CANCELLED.value)
             
-            current_app.logger.info(f"Cancelled job {job_id}")
+            logger.info("Cancelled job %s", job_id)
             return True
         
         return False
\ No newline at end of file
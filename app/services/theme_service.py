@@ -1,10 +1,40 @@
 """Theme service for managing poster themes."""
 
 import json
-import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from flask import current_app
+from werkzeug.local import LocalProxy
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is optional
+    _json_loads = json.loads
+
+# Number of themes shown on the home page
+FEATURED_THEME_COUNT = 6
+
+
+@lru_cache(maxsize=256)
+def _cached_load(path_str: str, mtime_ns: int) -> Dict:
+    """
+    Parse a theme JSON file, cached by path and modification time.
+    
+    Editing a theme file changes its mtime, so stale entries are never hit.
+    """
+    return _json_loads(Path(path_str).read_bytes())
+
+
+@lru_cache(maxsize=8)
+def _cached_listing(dir_str: str, mtime_ns: int) -> Tuple[Path, ...]:
+    """
+    List theme JSON files in a directory, cached by directory modification time.
+    
+    Adding or removing a file updates the directory mtime and invalidates the entry.
+    """
+    return tuple(sorted(Path(dir_str).glob("*.json")))
 
 
 class ThemeService:
@@ -12,41 +42,90 @@ class ThemeService:
     
     def __init__(self, themes_dir: str = "themes"):
         """
-        Initialize theme service.
+        Initialize theme service and preload all themes into memory.
         
         Args:
             themes_dir: Directory containing theme JSON files
         """
         self.themes_dir = Path(themes_dir)
+        self._themes: Dict[str, Dict] = {}
+        self._theme_summaries: List[Dict] = []
+        self._featured_themes: List[Dict] = []
+        self._dir_mtime_ns: Optional[int] = None
+        self.reload()
+    
+    def reload(self) -> None:
+        """
+        Rescan the themes directory and replace the in-memory theme table.
+        
+        Call this after editing theme files in place; added or removed files
+        are picked up automatically through the directory mtime.
+        """
+        themes = {}
+        dir_mtime_ns = self._get_dir_mtime_ns()
+        
+        if dir_mtime_ns is None:
+            current_app.logger.warning(f"Themes directory not found: {self.themes_dir}")
+        else:
+            for theme_file in _cached_listing(str(self.themes_dir), dir_mtime_ns):
+                theme_data = self._load_theme_file(theme_file)
+                if theme_data:
+                    themes[theme_file.stem] = theme_data
+        
+        self._themes = themes
+        self._theme_summaries = [
+            {
+                'id': theme_id,
+                'name': theme_data.get('name', theme_id),
+                'description': theme_data.get('description', ''),
+                'preview_url': f'/static/images/themes/{theme_id}_preview.png',
+                'colors': {
+                    'bg': theme_data.get('bg'),
+                    'text': theme_data.get('text')
+                }
+            }
+            for theme_id, theme_data in themes.items()
+        ]
+        self._featured_themes = self._theme_summaries[:FEATURED_THEME_COUNT]
+        self._dir_mtime_ns = dir_mtime_ns
+    
+    def _get_dir_mtime_ns(self) -> Optional[int]:
+        """Return the themes directory mtime in nanoseconds, or None if it is missing."""
+        try:
+            return self.themes_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _refresh_if_stale(self) -> None:
+        """Reload themes if the directory changed since the last scan (one stat call)."""
+        if self._get_dir_mtime_ns() != self._dir_mtime_ns:
+            self.reload()
     
     def get_all_themes(self) -> List[Dict]:
         """
         Get all available themes with metadata.
         
+        The summaries are built once per reload and shared between
+        callers, so treat the dictionaries as read-only.
+        
         Returns:
             List of theme dictionaries
         """
-        themes = []
-        
-        if not self.themes_dir.exists():
-            current_app.logger.warning(f"Themes directory not found: {self.themes_dir}")
-            return themes
+        self._refresh_if_stale()
+        return list(self._theme_summaries)
+    
+    def get_featured_themes(self) -> List[Dict]:
+        """
+        Get the themes shown on the home page.
         
-        for theme_file in sorted(self.themes_dir.glob("*.json")):
-            theme_data = self._load_theme_file(theme_file)
-            if theme_data:
-                themes.append({
-                    'id': theme_file.stem,
-                    'name': theme_data.get('name', theme_file.stem),
-                    'description': theme_data.get('description', ''),
-                    'preview_url': f'/static/images/themes/{theme_file.stem}_preview.png',
-                    'colors': {
-                        'bg': theme_data.get('bg'),
-                        'text': theme_data.get('text')
-                    }
-                })
+        The list is sliced once per reload and shared between callers,
+        so treat it as read-only.
         
-        return themes
+        Returns:
+            First FEATURED_THEME_COUNT theme dictionaries
+        """
+        self._refresh_if_stale()
+        return self._featured_themes
     
     def get_theme(self, theme_id: str) -> Optional[Dict]:
         """
@@ -58,19 +137,15 @@ class ThemeService:
         Returns:
             Theme dictionary or None if not found
         """
-        theme_file = self.themes_dir / f"{theme_id}.json"
-        
-        if not theme_file.exists():
-            return None
-        
-        theme_data = self._load_theme_file(theme_file)
+        self._refresh_if_stale()
+        theme_data = self._themes.get(theme_id)
         if theme_data:
             return {
                 'id': theme_id,
                 'name': theme_data.get('name', theme_id),
                 'description': theme_data.get('description', ''),
                 'preview_url': f'/static/images/themes/{theme_id}_preview.png',
-                'colors': theme_data
+                'colors': dict(theme_data)
             }
         
         return None
@@ -86,8 +161,9 @@ class ThemeService:
             Theme data dictionary or None on error
         """
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            mtime_ns = file_path.stat().st_mtime_ns
+            # Shallow copy so callers cannot mutate the cached entry
+            return dict(_cached_load(str(file_path), mtime_ns))
         except (json.JSONDecodeError, IOError) as e:
             current_app.logger.error(f"Error loading theme file {file_path}: {e}")
             return None
@@ -102,4 +178,11 @@ class ThemeService:
         Returns:
             True if theme exists, False otherwise
         """
-        return (self.themes_dir / f"{theme_id}.json").exists()
\ No newline at end of file
+        self._refresh_if_stale()
+        return theme_id in self._themes
+
+
+# Process-wide ThemeService created by the app factory, shared by all
+# requests so the preloaded theme table is built once. Views that call it
+# more than once resolve the proxy up front with _get_current_object()
+current_theme_service = LocalProxy(lambda: current_app.extensions['theme_service'])
@@ -1,59 +1,196 @@
 """Celery tasks for poster generation."""
 
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+import gc
 import os
-import traceback
+import time
 import uuid
+from celery import chord
 from flask import current_app
-from app.extensions import db
+from sqlalchemy.dialects.postgresql import JSONB
+from app.extensions import db, get_redis_client
 from app.models import Job, JobStatus, Poster
-from app.services.map_generator import get_coordinates, load_theme, fetch_map_data, render_poster
-from app.utils.batch_poster_generator import create_batch_posters
-from app.utils.file_helpers import generate_poster_filename, get_poster_path, generate_thumbnail
+from app.services.poster_service import (
+    invalidate_job_status_cache, publish_job_finished, publish_job_progress, stored_error_traceback
+)
+from app.services.map_generator import load_theme, fetch_map_data_cached, render_poster
+from app.utils.file_helpers import current_timestamp, generate_poster_filename, get_poster_path, generate_thumbnail
+from app.utils.format_helpers import get_format_dimensions, get_output_dimensions
 
 
-def update_progress(job_id: str, step: str, progress: int, add_to_steps: bool = True):
+# Live progress goes out through Redis on every update; the database copy
+# is written once PROGRESS_COMMIT_INTERVAL seconds have passed or progress
+# has moved PROGRESS_COMMIT_DELTA points since the last write. Updates in
+# between are buffered in Python rather than sent, so no transaction (and
+# no row lock on PostgreSQL) stays open between writes
+PROGRESS_COMMIT_INTERVAL = 2.0  # seconds
+PROGRESS_COMMIT_DELTA = 5  # percentage points
+
+# job_id -> (monotonic time of last progress commit, progress at that commit)
+_last_progress_commit: Dict[str, Tuple[float, int]] = {}
+
+# job_id -> progress not yet written: the latest step and percentage and
+# every step entry reported since the last write
+_pending_progress: Dict[str, Dict] = {}
+
+# job_id -> sequence number of the job's last progress step; steps can share
+# a millisecond timestamp, so clients key them on seq
+_progress_seq: Dict[str, int] = {}
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, matching the DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _should_commit_progress(job_id: str, progress: int) -> bool:
+    """Return True if a progress update for this job is due for a commit."""
+    last = _last_progress_commit.get(job_id)
+    if last is None:
+        return True
+    last_time, last_progress = last
+    return (time.monotonic() - last_time >= PROGRESS_COMMIT_INTERVAL
+            or abs(progress - last_progress) >= PROGRESS_COMMIT_DELTA)
+
+
+def _forget_progress(*job_ids: str) -> None:
+    """Drop buffered progress and debounce state for jobs that reached a final state."""
+    for job_id in job_ids:
+        _last_progress_commit.pop(job_id, None)
+        _pending_progress.pop(job_id, None)
+        _progress_seq.pop(job_id, None)
+
+
+def _append_progress_steps(job: Job, step_entries: List[Dict]) -> None:
+    """
+    Append entries to a job's progress_steps array.
+    
+    On PostgreSQL the entries are appended server-side with the JSONB ``||``
+    operator, so earlier steps are not re-serialized and rewritten on every
+    write. Other databases (SQLite in development) reassign the list, which
+    is what marks the plain JSON column as changed.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        steps = db.func.coalesce(db.cast(Job.progress_steps, JSONB), db.cast([], JSONB))
+        db.session.execute(
+            db.update(Job)
+            .where(Job.id == job.id)
+            .values(progress_steps=db.cast(
+                steps.op('||')(db.cast(step_entries, JSONB)), db.JSON
+            ))
+            .execution_options(synchronize_session=False)
+        )
+        # Reload the array from the database on next access
+        db.session.expire(job, ['progress_steps'])
+    else:
+        job.progress_steps = [*(job.progress_steps or []), *step_entries]
+
+
+def update_progress(job_id: str, step: str, progress: int, add_to_steps: bool = True, commit: bool = True):
     """
     Update job progress in database with detailed step tracking.
     
+    Every update is published through Redis for live clients. Database
+    writes are debounced: updates are buffered until a write is due, then
+    the latest step and all buffered step entries go out in one transaction.
+    
     Args:
         job_id: Job UUID
         step: Current step description
         progress: Progress percentage (0-100)
         add_to_steps: If True, add this step to progress_steps array
+        commit: If False, write the buffered progress into the session now
+            and leave the commit to the caller
     """
     try:
-        job = Job.query.get(job_id)
+        # Determine step status based on content
+        if step.endswith('✓') or 'downloaded' in step.lower() or 'completed' in step.lower():
+            status = 'completed'
+        elif step.endswith('...') or 'processing' in step.lower() or 'rendering' in step.lower():
+            status = 'in_progress'
+        else:
+            status = 'pending'
+        
+        pending = _pending_progress.setdefault(job_id, {'steps': []})
+        pending['step'] = step
+        pending['progress'] = progress
+        
+        # Add step to progress_steps array if requested
+        if add_to_steps:
+            # Add step with a per-job sequence number and timestamp
+            seq = _progress_seq[job_id] = _progress_seq.get(job_id, 0) + 1
+            pending['steps'].append({
+                'seq': seq,
+                'step': step,
+                'status': status,
+                'progress': progress,
+                'timestamp': time.time_ns() // 1_000_000  # Unix epoch milliseconds
+            })
+        
+        publish_job_progress(job_id, step, progress, status)
+        current_app.logger.info(f"Job {job_id} progress: {progress}% - {step}")
+        
+        if commit and not _should_commit_progress(job_id, progress):
+            return
+        
+        del _pending_progress[job_id]
+        job = db.session.get(Job, job_id)
         if job:
             job.current_step = step
             job.progress = progress
+            if pending['steps']:
+                _append_progress_steps(job, pending['steps'])
             
-            # Add step to progress_steps array if requested
-            if add_to_steps:
-                if job.progress_steps is None:
-                    job.progress_steps = []
-                
-                # Determine step status based on content
-                if step.endswith('✓') or 'downloaded' in step.lower() or 'completed' in step.lower():
-                    status = 'completed'
-                elif step.endswith('...') or 'processing' in step.lower() or 'rendering' in step.lower():
-                    status = 'in_progress'
-                else:
-                    status = 'pending'
-                
-                # Add step with timestamp
-                step_entry = {
-                    'step': step,
-                    'status': status,
-                    'progress': progress,
-                    'timestamp': datetime.utcnow().isoformat() + 'Z'
-                }
-                job.progress_steps.append(step_entry)
-            
-            db.session.commit()
-            current_app.logger.info(f"Job {job_id} progress: {progress}% - {step}")
+            if commit:
+                db.session.commit()
+                _last_progress_commit[job_id] = (time.monotonic(), progress)
+                invalidate_job_status_cache(job_id)
     except Exception as e:
         current_app.logger.error(f"Failed to update progress for job {job_id}: {e}")
+        # Leave the session usable for the task's own commits
+        db.session.rollback()
+
+
+def _poster_row(job: Job, result: Dict, width_inches: float, height_inches: float,
+                created_at: datetime) -> Dict:
+    """
+    Build the column values for a job's Poster row.
+    
+    Args:
+        job: Completed job (source of location and format fields)
+        result: Render result with filename, file_path, file_size, width, height
+        width_inches: Poster width in inches
+        height_inches: Poster height in inches
+        created_at: Creation timestamp
+        
+    Returns:
+        Dict of Poster column values, including a new id
+    """
+    return {
+        'id': str(uuid.uuid4()),
+        'job_id': job.id,
+        'city': job.city,
+        'country': job.country,
+        'theme': job.theme,
+        'distance': job.distance,
+        'latitude': job.latitude,
+        'longitude': job.longitude,
+        'filename': result['filename'],
+        'file_path': result['file_path'],
+        'file_size': result['file_size'],
+        'width': result['width'],
+        'height': result['height'],
+        'width_inches': width_inches,
+        'height_inches': height_inches,
+        'page_format': job.page_format,
+        'orientation': job.orientation,
+        'dpi': job.dpi,
+        'custom_width_inches': job.custom_width_inches,
+        'custom_height_inches': job.custom_height_inches,
+        'session_id': job.session_id,
+        'created_at': created_at
+    }
 
 
 def register_tasks(celery_app):
@@ -63,223 +200,154 @@ def register_tasks(celery_app):
     This must be called after celery app is created.
     """
     
+    @celery_app.task(name='app.tasks.generate_thumbnail')
+    def generate_thumbnail_task(poster_id: str, file_path: str):
+        """
+        Generate a poster thumbnail and record its path.
+        
+        Runs on the low-priority ``thumbnails`` queue so render workers are
+        not held up by image resizing.
+        
+        Args:
+            poster_id: Poster UUID
+            file_path: Absolute path to the poster image
+            
+        Returns:
+            Dict with the thumbnail path, or the error on failure
+        """
+        try:
+            thumbnail_path = os.path.abspath(generate_thumbnail(file_path))
+        except Exception as e:
+            current_app.logger.warning(f"Failed to generate thumbnail for poster {poster_id}: {e}")
+            return {'status': 'failed', 'error': str(e)}
+        
+        db.session.execute(
+            db.update(Poster).where(Poster.id == poster_id).values(thumbnail_path=thumbnail_path)
+        )
+        db.session.commit()
+        current_app.logger.info(f"Generated thumbnail for poster {poster_id}: {thumbnail_path}")
+        
+        return {'status': 'completed', 'thumbnail_path': thumbnail_path}
+    
+    def enqueue_thumbnail(poster_id: str, file_path: str) -> None:
+        """Queue thumbnail generation for a committed poster row."""
+        try:
+            generate_thumbnail_task.apply_async(args=[poster_id, file_path], queue='thumbnails')
+        except Exception as e:
+            current_app.logger.warning(f"Failed to queue thumbnail for poster {poster_id}: {e}")
+    
+    # The coordinator is acknowledged on receipt: redelivering it after the
+    # chord has been dispatched would queue every theme a second time
     @celery_app.task(bind=True, name='app.tasks.generate_batch_posters')
     def generate_batch_posters(self, batch_id: str, job_ids: list):
         """
-        Generate batch of posters with different themes in background.
+        Coordinate a batch of posters with different themes.
+        
+        Prefetches the shared map data, then dispatches one generate_poster
+        task per job as a chord whose callback is finalize_batch.
         
         Args:
             batch_id: Batch UUID for tracking
             job_ids: List of job UUIDs for individual themes
             
         Returns:
-            Dict with status and results information
+            Dict with dispatch status information
         """
-        # Get all jobs with retries
-        import time
+        # Reclaim figures and frames left behind by the previous render
+        gc.collect()
+        
+        # Fetch all jobs in one query, retrying only the ids that are not
+        # visible yet (the web process may still be committing them). The
+        # coordinator only needs the location columns, not ORM objects
         max_attempts = 5
-        jobs = []
+        jobs_by_id = {}
+        missing = list(job_ids)
         
-        for job_id in job_ids:
-            for attempt in range(max_attempts):
-                db.session.expire_all()
-                job = Job.query.get(job_id)
-                if job:
-                    jobs.append(job)
-                    break
-                if attempt < max_attempts - 1:
-                    current_app.logger.warning(f"Job {job_id} not found, retrying ({attempt + 1}/{max_attempts})")
-                    time.sleep(0.5)
-            
-            if not job:
-                current_app.logger.error(f"Job {job_id} not found after {max_attempts} attempts")
+        for attempt in range(max_attempts):
+            rows = db.session.execute(
+                db.select(Job.id, Job.latitude, Job.longitude, Job.distance).where(Job.id.in_(missing))
+            )
+            for job in rows:
+                jobs_by_id[job.id] = job
+            missing = [job_id for job_id in missing if job_id not in jobs_by_id]
+            if not missing:
+                break
+            if attempt < max_attempts - 1:
+                current_app.logger.warning(
+                    f"{len(missing)} job(s) of batch {batch_id} not found, retrying ({attempt + 1}/{max_attempts})"
+                )
+                time.sleep(0.1 * 2 ** attempt)
+        
+        for job_id in missing:
+            current_app.logger.error(f"Job {job_id} not found after {max_attempts} attempts")
+        
+        # Keep the order the jobs were created in
+        jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
         
         if not jobs:
             current_app.logger.error(f"No jobs found for batch {batch_id}")
             return {'error': 'No jobs found'}
         
-        # Get common parameters from first job
-        first_job = jobs[0]
-        city = first_job.city
-        country = first_job.country
-        distance = first_job.distance
-        latitude = first_job.latitude
-        longitude = first_job.longitude
-        preview_mode = first_job.preview_mode
-        session_id = first_job.session_id
-        
-        # Get format parameters from first job
-        from app.utils.format_helpers import get_format_dimensions
-        
-        width_inches, height_inches = get_format_dimensions(
-            format_id=first_job.page_format,
-            orientation=first_job.orientation,
-            custom_width=first_job.custom_width_inches,
-            custom_height=first_job.custom_height_inches
-        )
-        
-        dpi = first_job.dpi
-        
-        current_app.logger.info(f"Batch format: {width_inches}\" × {height_inches}\" at {dpi} DPI")
-        
-        # Extract theme list
-        themes = [job.theme for job in jobs]
+        # All jobs of a batch share the same location and distance
+        point = (jobs[0].latitude, jobs[0].longitude)
+        distance = jobs[0].distance
+        job_ids = [job.id for job in jobs]
+        del jobs, jobs_by_id
         
         try:
-            # Update all jobs to PROCESSING
-            for job in jobs:
-                job.status = JobStatus.PROCESSING
-                job.started_at = datetime.utcnow()
+            db.session.execute(
+                db.update(Job)
+                .where(Job.id.in_(job_ids))
+                .values(status=JobStatus.PROCESSING, started_at=_utcnow())
+            )
             db.session.commit()
+            invalidate_job_status_cache(*job_ids)
             
-            current_app.logger.info(f"Starting batch poster generation for batch {batch_id}")
-            current_app.logger.info(f"Batch details - City: {city}, Country: {country}, Themes: {themes}, Distance: {distance}m")
-            
-            # Create job map for quick lookup by theme
-            job_map = {job.theme: job for job in jobs}
-            posters_created = []
-            
-            # Define job progress callback to update individual jobs
-            def job_progress_callback(theme, step_message, progress_percent):
-                """Update progress for a specific job by theme"""
-                job = job_map.get(theme)
-                if job:
-                    try:
-                        update_progress(job.id, step_message, progress_percent, add_to_steps=True)
-                    except Exception as e:
-                        current_app.logger.error(f"Error updating progress for job {job.id}: {e}")
-            
-            # Define result callback to process each poster as it completes
-            def result_callback(result):
-                """Process each poster result immediately as it completes"""
-                theme = result['theme']
-                job = job_map.get(theme)
-                
-                if not job:
-                    current_app.logger.warning(f"No job found for theme {theme}")
-                    return
-                
-                current_app.logger.info(f"Processing result for theme {theme}: {result['status']}")
-                
-                if result['status'] == 'success':
-                    # Generate thumbnail
-                    thumbnail_path = None
-                    try:
-                        thumbnail_path = generate_thumbnail(result['file_path'])
-                        current_app.logger.info(f"Generated thumbnail for {theme}: {thumbnail_path}")
-                    except Exception as e:
-                        current_app.logger.warning(f"Failed to generate thumbnail for {theme}: {e}")
-                    
-                    # Get image dimensions
-                    width = result.get('width', int(width_inches * dpi))
-                    height = result.get('height', int(height_inches * dpi))
-                    
-                    # Create poster record
-                    poster = Poster(
-                        id=str(uuid.uuid4()),
-                        job_id=job.id,
-                        city=city,
-                        country=country,
-                        theme=theme,
-                        distance=distance,
-                        latitude=latitude,
-                        longitude=longitude,
-                        filename=result['filename'],
-                        file_path=result['file_path'],
-                        file_size=result['file_size'],
-                        width=width,
-                        height=height,
-                        width_inches=width_inches,
-                        height_inches=height_inches,
-                        page_format=job.page_format,
-                        orientation=job.orientation,
-                        dpi=dpi,
-                        custom_width_inches=job.custom_width_inches,
-                        custom_height_inches=job.custom_height_inches,
-                        thumbnail_path=thumbnail_path,
-                        session_id=session_id,
-                        created_at=datetime.utcnow()
-                    )
-                    
-                    db.session.add(poster)
-                    db.session.flush()  # Get poster.id
-                    
-                    # Update job status immediately
-                    job.status = JobStatus.COMPLETED
-                    job.completed_at = datetime.utcnow()
-                    job.progress = 100
-                    job.current_step = f"Complete! {theme}"
-                    job.result = {'poster_id': poster.id}
-                    
-                    # Commit immediately so the UI can show the completed poster
-                    db.session.commit()
-                    
-                    posters_created.append(poster.id)
-                    current_app.logger.info(f"Job {job.id} (theme: {theme}) completed successfully. Poster: {poster.id}")
-                    
-                else:
-                    # Update job with error immediately
-                    job.status = JobStatus.FAILED
-                    job.failed_at = datetime.utcnow()
-                    job.error_type = 'BatchGenerationError'
-                    job.error_message = result.get('error', 'Unknown error')
-                    job.current_step = f"Failed: {theme}"
-                    job.progress = 100
-                    
-                    # Commit immediately so the UI can show the failure
-                    db.session.commit()
-                    
-                    current_app.logger.error(f"Job {job.id} (theme: {theme}) failed: {job.error_message}")
-            
-            # Generate batch posters with per-job progress and result callbacks
-            current_app.logger.info(f"Calling batch poster generator for {len(themes)} themes")
-            results = create_batch_posters(
-                city=city,
-                country=country,
-                themes=themes,
-                distance=distance,
-                preview_mode=preview_mode,
-                width_inches=width_inches,
-                height_inches=height_inches,
-                dpi=dpi,
-                progress_callback=None,  # Don't use batch-wide callback
-                job_progress_callback=job_progress_callback,  # Update individual jobs
-                result_callback=result_callback  # Process results immediately
-            )
-            current_app.logger.info(f"Batch generation completed for {batch_id}")
-            current_app.logger.info(f"Results received for {len(results)} themes")
+            current_app.logger.info(f"Starting batch poster generation for batch {batch_id} ({len(job_ids)} themes)")
             
-            # All results have been processed incrementally via result_callback
-            # Just log the final summary
-            current_app.logger.info(f"All jobs processed")
+            # Download map data once into the shared cache so the per-theme
+            # tasks below render from it instead of re-fetching OSM data
+            fetch_map_data_cached(point, distance, redis_client=get_redis_client(current_app), store_async=False)
             
-            success_count = len(posters_created)
-            current_app.logger.info(f"Batch {batch_id} completed: {success_count}/{len(jobs)} posters created")
+            # Render every theme as its own task on any available worker;
+            # finalize_batch runs once all of them have finished
+            chord(generate_poster.s(job_id) for job_id in job_ids)(finalize_batch.s(batch_id, job_ids))
+            
+            current_app.logger.info(f"Batch {batch_id} dispatched as {len(job_ids)} poster tasks")
             
             return {
-                'status': 'completed',
+                'status': 'dispatched',
                 'batch_id': batch_id,
-                'total': len(jobs),
-                'successful': success_count,
-                'poster_ids': posters_created
+                'total': len(job_ids)
             }
             
         except Exception as e:
             # Log error with full details
-            current_app.logger.error(f"Exception in batch poster generation for batch {batch_id}", exc_info=True)
+            error_id = uuid.uuid4().hex
+            current_app.logger.error(
+                f"Exception in batch poster generation for batch {batch_id} (error id {error_id})", exc_info=True
+            )
             current_app.logger.error(f"Error type: {type(e).__name__}")
             current_app.logger.error(f"Error message: {str(e)}")
             
-            # Update all jobs with error
-            for job in jobs:
-                if job.status != JobStatus.COMPLETED:
-                    job.status = JobStatus.FAILED
-                    job.failed_at = datetime.utcnow()
-                    job.error_type = type(e).__name__
-                    job.error_message = str(e)
-                    job.error_traceback = traceback.format_exc()
-            
+            # Update all unfinished jobs with error
+            db.session.rollback()
+            db.session.execute(
+                db.update(Job)
+                .where(Job.id.in_(job_ids), Job.status != JobStatus.COMPLETED)
+                .values(
+                    status=JobStatus.FAILED,
+                    failed_at=_utcnow(),
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    error_traceback=stored_error_traceback(error_id)
+                )
+            )
             db.session.commit()
+            _forget_progress(*job_ids)
+            invalidate_job_status_cache(*job_ids)
+            for job_id in job_ids:
+                publish_job_finished(job_id, JobStatus.FAILED.value)
             
             current_app.logger.info(f"Batch {batch_id} marked as FAILED in database")
             
@@ -289,6 +357,30 @@ def register_tasks(celery_app):
                 'batch_id': batch_id
             }
     
+    @celery_app.task(name='app.tasks.finalize_batch')
+    def finalize_batch(results: list, batch_id: str, job_ids: list):
+        """
+        Summarize a batch once all of its poster tasks have finished.
+        
+        Args:
+            results: Return values of the per-theme generate_poster tasks
+            batch_id: Batch UUID
+            job_ids: Job UUIDs in the batch
+            
+        Returns:
+            Dict with status and results information
+        """
+        poster_ids = list(db.session.scalars(db.select(Poster.id).where(Poster.job_id.in_(job_ids))))
+        current_app.logger.info(f"Batch {batch_id} completed: {len(poster_ids)}/{len(job_ids)} posters created")
+        
+        return {
+            'status': 'completed',
+            'batch_id': batch_id,
+            'total': len(job_ids),
+            'successful': len(poster_ids),
+            'poster_ids': poster_ids
+        }
+    
     @celery_app.task(bind=True, name='app.tasks.generate_poster')
     def generate_poster(self, job_id: str):
         """
@@ -300,17 +392,21 @@ def register_tasks(celery_app):
         Returns:
             Dict with status and result information
         """
+        # Reclaim figures and frames left behind by the previous render
+        gc.collect()
+        
         # Try to find the job with retries (SQLite cross-process issue)
-        import time
         max_attempts = 5
         for attempt in range(max_attempts):
-            db.session.expire_all()  # Clear session cache
-            job = Job.query.get(job_id)
+            # populate_existing re-reads just this row even if a stale copy is
+            # in the identity map (eager mode shares the scoped session),
+            # without expiring the rest of the session
+            job = db.session.get(Job, job_id, populate_existing=True)
             if job:
                 break
             if attempt < max_attempts - 1:
                 current_app.logger.warning(f"Job {job_id} not found, retrying ({attempt + 1}/{max_attempts})")
-                time.sleep(0.5)  # Wait 500ms before retry
+                time.sleep(0.1 * 2 ** attempt)  # 0.1s, 0.2s, 0.4s, 0.8s
         
         if not job:
             current_app.logger.error(f"Job {job_id} not found after {max_attempts} attempts")
@@ -319,9 +415,11 @@ def register_tasks(celery_app):
         try:
             # Update job status and initialize progress tracking
             job.status = JobStatus.PROCESSING
-            job.started_at = datetime.utcnow()
+            job.started_at = _utcnow()
             job.progress_steps = []  # Initialize empty steps array
             db.session.commit()
+            _forget_progress(job_id)  # Restart step numbering for this run
+            invalidate_job_status_cache(job_id)
             
             current_app.logger.info(f"Starting poster generation for job {job_id}")
             current_app.logger.info(f"Job details - City: {job.city}, Country: {job.country}, Theme: {job.theme}, Distance: {job.distance}m")
@@ -343,7 +441,9 @@ def register_tasks(celery_app):
             
             # Step 3: Generate filename (25%)
             progress_callback("Preparing output file", 25)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Second-resolution stamp plus a monotonic suffix so posters for the
+            # same city and theme finishing in the same second do not collide
+            timestamp = f"{current_timestamp()}_{time.monotonic_ns() & 0xffff:04x}"
             filename = generate_poster_filename(job.city, job.theme, timestamp)
             output_file = get_poster_path(filename, 'posters')
             
@@ -359,11 +459,13 @@ def register_tasks(celery_app):
                 elif data_type == 'parks':
                     progress_callback("Parks downloaded ✓", 60)
             
-            map_data = fetch_map_data(point, job.distance, progress_callback=fetch_progress_callback)
+            map_data = fetch_map_data_cached(
+                point, job.distance,
+                redis_client=get_redis_client(current_app),
+                progress_callback=fetch_progress_callback
+            )
             
             # Step 4.5: Get dimensions from job format parameters
-            from app.utils.format_helpers import get_format_dimensions, calculate_output_dimensions
-            
             width_inches, height_inches = get_format_dimensions(
                 format_id=job.page_format,
                 orientation=job.orientation,
@@ -371,9 +473,10 @@ def register_tasks(celery_app):
                 custom_height=job.custom_height_inches
             )
             
-            # Calculate output pixel dimensions
-            width_px, height_px = calculate_output_dimensions(
-                width_inches, height_inches, job.dpi
+            # Output pixel dimensions (table lookup for standard formats)
+            width_px, height_px = get_output_dimensions(
+                job.page_format, job.orientation, job.dpi,
+                job.custom_width_inches, job.custom_height_inches
             )
             
             current_app.logger.info(f"Poster dimensions: {width_inches}\" × {height_inches}\" at {job.dpi} DPI = {width_px}×{height_px} pixels")
@@ -394,7 +497,7 @@ def register_tasks(celery_app):
                 elif stage == 'saving':
                     progress_callback("Saving poster...", 90)
             
-            render_poster(
+            rendered = render_poster(
                 map_data=map_data,
                 theme=theme_obj,
                 city=job.city,
@@ -407,30 +510,18 @@ def register_tasks(celery_app):
                 progress_callback=render_progress_callback
             )
             
-            # Step 6: Verify file was created
-            if not os.path.exists(output_file):
+            # Step 6: Verify file was created; render_poster already stat'ed it
+            file_size = rendered['file_size']
+            if file_size is None:
                 raise FileNotFoundError(f"Poster file was not created: {output_file}")
             
             # Convert to absolute path
             absolute_path = os.path.abspath(output_file)
             
-            # Get file info
-            file_size = os.path.getsize(absolute_path)
-            
             # Use calculated dimensions
             width = width_px
             height = height_px
             
-            # Step 7: Generate thumbnail (90-95%)
-            progress_callback("Generating thumbnail...", 95)
-            
-            thumbnail_path = None
-            try:
-                thumbnail_path = generate_thumbnail(absolute_path)
-                thumbnail_path = os.path.abspath(thumbnail_path)
-            except Exception as e:
-                current_app.logger.warning(f"Failed to generate thumbnail: {e}")
-            
             progress_callback("Complete!", 100)
             
             result = {
@@ -438,69 +529,67 @@ def register_tasks(celery_app):
                 'file_path': absolute_path,
                 'file_size': file_size,
                 'width': width,
-                'height': height,
-                'thumbnail_path': thumbnail_path
+                'height': height
             }
             current_app.logger.info(f"Poster generation completed for job {job_id}, file: {result.get('filename')}")
             
-            # Create poster record
-            poster = Poster(
-                id=str(uuid.uuid4()),
-                job_id=job.id,
-                city=job.city,
-                country=job.country,
-                theme=job.theme,
-                distance=job.distance,
-                latitude=job.latitude,
-                longitude=job.longitude,
-                filename=result['filename'],
-                file_path=result['file_path'],
-                file_size=result['file_size'],
-                width=result['width'],
-                height=result['height'],
-                width_inches=width_inches,
-                height_inches=height_inches,
-                page_format=job.page_format,
-                orientation=job.orientation,
-                dpi=job.dpi,
-                custom_width_inches=job.custom_width_inches,
-                custom_height_inches=job.custom_height_inches,
-                thumbnail_path=result.get('thumbnail_path'),
-                session_id=job.session_id,
-                created_at=datetime.utcnow()
-            )
+            # Create poster record (same timestamp as the job completion)
+            completed_at = _utcnow()
+            poster_row = _poster_row(job, result, width_inches, height_inches, completed_at)
+            poster_id = poster_row['id']
             
-            # Update job with final step
-            update_progress(job_id, "Complete!", 100)
+            # Update job with final step (committed with the poster below)
+            update_progress(job_id, "Complete!", 100, commit=False)
             
             job.status = JobStatus.COMPLETED
-            job.completed_at = datetime.utcnow()
-            job.result = {'poster_id': poster.id}  # Add result for template
+            job.completed_at = completed_at
+            job.result = {'poster_id': poster_id}  # Add result for template
             
-            db.session.add(poster)
+            # Core INSERT: no Poster instance or unit-of-work bookkeeping
+            db.session.execute(db.insert(Poster), [poster_row])
             db.session.commit()
+            _forget_progress(job_id)
+            invalidate_job_status_cache(job_id)
+            publish_job_finished(job_id, JobStatus.COMPLETED.value)
             
-            current_app.logger.info(f"Job {job_id} completed successfully. Poster: {poster.id}")
+            # Step 7: Thumbnail is generated off the render worker
+            enqueue_thumbnail(poster_id, absolute_path)
+            
+            current_app.logger.info(f"Job {job_id} completed successfully. Poster: {poster_id}")
             
             return {
                 'status': 'completed',
-                'poster_id': poster.id,
-                'filename': poster.filename
+                'poster_id': poster_id,
+                'filename': poster_row['filename']
             }
             
         except Exception as e:
             # Log error with full details
-            current_app.logger.error(f"Exception in poster generation for job {job_id}", exc_info=True)
+            error_id = uuid.uuid4().hex
+            current_app.logger.error(
+                f"Exception in poster generation for job {job_id} (error id {error_id})", exc_info=True
+            )
             current_app.logger.error(f"Error type: {type(e).__name__}")
             current_app.logger.error(f"Error message: {str(e)}")
             
-            # Update job with error
-            job.status = JobStatus.FAILED
-            job.failed_at = datetime.utcnow()
-            job.error_type = type(e).__name__
-            job.error_message = str(e)
-            job.error_traceback = traceback.format_exc()
+            # Update job with error; the failure may have left the session's
+            # transaction unusable, so start a fresh one
+            db.session.rollback()
+            db.session.execute(
+                db.update(Job)
+                .where(Job.id == job_id)
+                .values(
+                    status=JobStatus.FAILED,
+                    failed_at=_utcnow(),
+                    error_type=type(e).__name__,
+                    error_message=str(e),
+                    error_traceback=stored_error_traceback(error_id)
+                )
+            )
             db.session.commit()
+            _forget_progress(job_id)
+            invalidate_job_status_cache(job_id)
+            publish_job_finished(job_id, JobStatus.FAILED.value)
             
             current_app.logger.info(f"Job {job_id} marked as FAILED in database")
             
@@ -509,8 +598,8 @@ def register_tasks(celery_app):
                 'error': str(e)
             }
     
-    return generate_poster, generate_batch_posters
+    return generate_poster, generate_batch_posters, generate_thumbnail_task
 
 
 # Export the task functions for registration
-__all__ = ['generate_poster_task', 'generate_batch_posters_task']
\ No newline at end of file
+__all__ = ['generate_poster_task', 'generate_batch_posters_task', 'generate_thumbnail_task']
\ No newline at end of file
@@ -1,6 +1,5 @@
 """Utility functions and helpers."""
 
-from .batch_poster_generator import BatchPosterGenerator, create_batch_posters
 from .file_helpers import (
     generate_poster_filename,
     get_poster_path,
@@ -9,7 +8,9 @@ from .file_helpers import (
     generate_thumbnail,
     generate_thumbnails_batch,
     thumbnail_exists,
-    get_file_size
+    get_file_size,
+    read_png_dimensions,
+    current_timestamp
 )
 
 __all__ = [
@@ -22,5 +23,20 @@ __all__ = [
     'generate_thumbnail',
     'generate_thumbnails_batch',
     'thumbnail_exists',
-    'get_file_size'
-]
\ No newline at end of file
+    'get_file_size',
+    'read_png_dimensions',
+    'current_timestamp'
+]
+
+
+def __getattr__(name):
+    """
+    Import the batch generator on first use.
+    
+    It loads matplotlib, osmnx and the map generator, which most importers
+    of this package (format and file helpers) never need.
+    """
+    if name in ('BatchPosterGenerator', 'create_batch_posters'):
+        from . import batch_poster_generator
+        return getattr(batch_poster_generator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
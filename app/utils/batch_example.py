@@ -2,14 +2,21 @@
 Example usage of BatchPosterGenerator.
 
 This demonstrates how to use the batch poster generator
-from Python code.
+from Python code. Run an example with:
+
+    python -m app.utils.batch_example basic|progress|custom
+
+The generator (and with it matplotlib/osmnx) is only imported when an
+example runs, so importing this module is cheap.
 """
 
-from batch_poster_generator import BatchPosterGenerator, create_batch_posters
+import argparse
 
 
 def example_basic():
     """Basic example - generate 3 themes for a city."""
+    from app.utils.batch_poster_generator import create_batch_posters
+    
     print("Example 1: Basic batch generation")
     print("-" * 60)
     
@@ -29,6 +36,8 @@ def example_basic():
 
 def example_with_progress():
     """Example with progress callback."""
+    from app.utils.batch_poster_generator import create_batch_posters
+    
     print("\nExample 2: With progress callback")
     print("-" * 60)
     
@@ -50,6 +59,8 @@ def example_with_progress():
 
 def example_custom_class():
     """Example using the class directly with custom settings."""
+    from app.utils.batch_poster_generator import BatchPosterGenerator
+    
     print("\nExample 3: Custom class usage")
     print("-" * 60)
     
@@ -76,15 +87,22 @@ def example_custom_class():
             print(f"  Time: {result['render_time']:.2f}s")
 
 
+EXAMPLES = {
+    'basic': example_basic,
+    'progress': example_with_progress,
+    'custom': example_custom_class,
+}
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='BatchPosterGenerator examples')
+    parser.add_argument('examples', nargs='+', choices=sorted(EXAMPLES), help='Examples to run')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("BatchPosterGenerator Examples")
     print("=" * 60)
     print()
     
-    # Uncomment to run examples:
-    # example_basic()
-    # example_with_progress()
-    # example_custom_class()
-    
-    print("\nUncomment examples in the code to run them.")
\ No newline at end of file
+    for name in args.examples:
+        EXAMPLES[name]()
@@ -5,18 +5,182 @@ This module provides efficient batch generation of map posters with multiple the
 by fetching OSM data once and rendering with different themes in parallel.
 """
 
+import io
 import os
+import time
 import logging
-from datetime import datetime
+import multiprocessing
+import pickle
+import queue
+import tempfile
+import threading
 from typing import List, Dict, Tuple, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # Import from app.services.map_generator
-from app.services.map_generator import fetch_map_data, render_poster, load_theme, get_coordinates
+from app.services.map_generator import fetch_map_data_cached, render_poster, load_theme, get_coordinates
+from app.utils.file_helpers import current_timestamp
 
 logger = logging.getLogger(__name__)
 
+# Filename slugs replace spaces in one pass
+_SLUG_TABLE = str.maketrans(' ', '_')
+
+# Modules the fork server imports once so each render worker starts with
+# them loaded, without the web or Celery setup of the app package
+_RENDER_PRELOAD_MODULES = ['matplotlib', 'app.services.map_generator']
+
+# Spill directory for map data handed to pool workers; tmpfs keeps the
+# single shared copy in the page cache
+_MAP_DATA_SPILL_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# One cleared figure per process, reused while the poster size and DPI stay
+# the same so its Agg render buffer is not reallocated for every theme
+_pooled_figure: Optional[Tuple[Tuple[float, float, int], Figure]] = None
+
+# Batch-wide job progress reported as each map data download finishes
+FETCH_PROGRESS_STEPS = {
+    'streets': ("Streets downloaded ✓", 40),
+    'water': ("Water features downloaded ✓", 50),
+    'parks': ("Parks downloaded ✓", 60),
+}
+
+# Map data for the current batch, set once per render process by _init_render_worker
+_worker_map_data: Optional[Dict] = None
+
+
+def _init_render_worker(map_data_path: str) -> None:
+    """
+    Process pool initializer: load the batch's map data and warm matplotlib.
+    
+    The data is read from a pickle the parent wrote once for the whole pool,
+    rather than being serialized again for every worker or theme. The font
+    cache lookup is paid before the first render.
+    """
+    global _worker_map_data
+    with open(map_data_path, 'rb') as f:
+        _worker_map_data = pickle.load(f)
+    
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import font_manager
+    font_manager.findfont(font_manager.FontProperties())
+
+
+def _checkout_figure(width_inches: float, height_inches: float, dpi: int) -> Figure:
+    """Take the pooled figure if it matches the poster size, else create one."""
+    global _pooled_figure
+    key = (width_inches, height_inches, dpi)
+    pooled, _pooled_figure = _pooled_figure, None
+    if pooled is not None and pooled[0] == key:
+        return pooled[1]
+    
+    fig = Figure(figsize=(width_inches, height_inches), dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def _release_figure(fig: Figure, width_inches: float, height_inches: float, dpi: int) -> None:
+    """Clear a figure and keep it for the next render in this process."""
+    global _pooled_figure
+    fig.clf()
+    _pooled_figure = ((width_inches, height_inches, dpi), fig)
+
+
+def _write_poster_file(output_file: str, buffer: io.BytesIO) -> None:
+    """Write an in-memory encoded poster to disk."""
+    with open(output_file, 'wb') as f:
+        f.write(buffer.getbuffer())
+
+
+def _render_mp_context() -> multiprocessing.context.BaseContext:
+    """
+    Multiprocessing context for the render pool.
+    
+    Workers are started from a fork server, not forked from the batch
+    process: by the time the pool starts, the callback dispatcher and the
+    map cache writer threads are running, and forking a multi-threaded
+    process can copy a lock held by one of them. Spawn is used where there
+    is no fork server.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(_RENDER_PRELOAD_MODULES)
+    return context
+
+
+def _spill_map_data(map_data: Dict) -> str:
+    """
+    Pickle map data once to a temporary file for the render pool workers.
+    
+    Args:
+        map_data: Pre-fetched map data dictionary
+        
+    Returns:
+        Path of the pickle file; the caller removes it when the pool exits
+    """
+    fd, path = tempfile.mkstemp(prefix='map_data_', suffix='.pkl', dir=_MAP_DATA_SPILL_DIR)
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(map_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _render_theme_in_worker(theme_name: str, theme: Dict, city: str, country: str, point: Tuple[float, float],
+                            output_file: str, width_inches: float, height_inches: float, dpi: int) -> Dict:
+    """Render one theme in a pool process using the map data from the initializer."""
+    return _render_single_theme(
+        map_data=_worker_map_data,
+        theme_name=theme_name,
+        theme=theme,
+        city=city,
+        country=country,
+        point=point,
+        output_file=output_file,
+        width_inches=width_inches,
+        height_inches=height_inches,
+        dpi=dpi
+    )
+
+
+class _CallbackDispatcher:
+    """
+    Run a result callback on a background thread, in submission order.
+    
+    Lets the render loop move on to the next theme while the consumer
+    (database write, thumbnail trigger, upload) handles the previous result.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, callback: Callable):
+        self._callback = callback
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='batch-result-callback', daemon=True)
+        self._thread.start()
+    
+    def put(self, result: Dict) -> None:
+        """Queue a result for the callback."""
+        self._queue.put(result)
+    
+    def close(self) -> None:
+        """Wait until every queued result has been handled."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+    
+    def _run(self) -> None:
+        while True:
+            result = self._queue.get()
+            if result is self._STOP:
+                return
+            try:
+                self._callback(result)
+            except Exception as e:
+                logger.error(f"Error in result callback for theme {result.get('theme')}: {e}")
+
 
 class BatchPosterGenerator:
     """
@@ -38,9 +202,7 @@ class BatchPosterGenerator:
         self.max_render_workers = max_render_workers
         
         # Ensure output directory exists
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-            logger.info(f"Created output directory: {output_dir}")
+        os.makedirs(output_dir, exist_ok=True)
     
     def generate_filename(self, city: str, theme: str, timestamp: str = None) -> str:
         """
@@ -55,9 +217,9 @@ class BatchPosterGenerator:
             Full path to output file: {output_dir}/{city_slug}_{theme}_{timestamp}.png
         """
         if timestamp is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = current_timestamp()
         
-        city_slug = city.lower().replace(' ', '_')
+        city_slug = city.translate(_SLUG_TABLE).lower()
         filename = f"{city_slug}_{theme}_{timestamp}.png"
         return os.path.join(self.output_dir, filename)
     
@@ -93,9 +255,12 @@ class BatchPosterGenerator:
             dpi: DPI resolution (default: 300)
             progress_callback: Optional callback(current_step, total_steps, message)
             job_progress_callback: Optional callback(theme, step_message, progress_percent)
-                                   Called for each individual job's progress
-            result_callback: Optional callback(result_dict) called immediately when each theme completes
-                           This allows processing results as they complete rather than at the end
+                                   Called for each individual job's progress; theme is
+                                   None for steps shared by every theme in the batch
+            result_callback: Optional callback(result_dict) called as soon as each theme completes
+                           This allows processing results as they complete rather than at the end.
+                           It runs on a background thread so slow consumers do not hold up the
+                           next render; all calls finish before this method returns
             
         Returns:
             List of result dictionaries, one per theme:
@@ -110,6 +275,7 @@ class BatchPosterGenerator:
         results = []
         total_steps = len(themes) + 2  # +2 for geocoding and data fetch
         current_step = 0
+        dispatcher = _CallbackDispatcher(result_callback) if result_callback else None
         
         try:
             # Step 1: Get coordinates
@@ -128,101 +294,167 @@ class BatchPosterGenerator:
             
             # Update all jobs to show data fetching
             if job_progress_callback:
-                for theme_name in themes:
-                    job_progress_callback(theme_name, "Downloading map data...", 30)
+                job_progress_callback(None, "Downloading map data...", 30)
             
             logger.info(f"Fetching map data for distance={distance}m")
             
-            # Define a callback for fetch_map_data to track download progress
+            # Define a callback for fetch_map_data to track download progress;
+            # each download step is one broadcast event for the whole batch
             def fetch_progress_callback(data_type, completed, total):
                 """Handle progress from fetch_map_data"""
-                if job_progress_callback:
-                    if data_type == 'streets':
-                        for theme_name in themes:
-                            job_progress_callback(theme_name, "Streets downloaded ✓", 40)
-                    elif data_type == 'water':
-                        for theme_name in themes:
-                            job_progress_callback(theme_name, "Water features downloaded ✓", 50)
-                    elif data_type == 'parks':
-                        for theme_name in themes:
-                            job_progress_callback(theme_name, "Parks downloaded ✓", 60)
+                if job_progress_callback and data_type in FETCH_PROGRESS_STEPS:
+                    job_progress_callback(None, *FETCH_PROGRESS_STEPS[data_type])
             
-            map_data = fetch_map_data(point, distance, progress_callback=fetch_progress_callback)
+            map_data = fetch_map_data_cached(point, distance, progress_callback=fetch_progress_callback)
             logger.info("Map data fetched successfully")
             
             # Use a shared timestamp for all posters in this batch
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = current_timestamp()
             
-            # Step 3: Render each theme SEQUENTIALLY (matplotlib is not thread-safe)
-            # Even with 'Agg' backend, parallel rendering causes color corruption and blank outputs
-            logger.info(f"Starting SEQUENTIAL rendering of {len(themes)} themes (matplotlib thread-safety)")
-            logger.warning("Note: Parallel rendering disabled due to matplotlib thread-safety issues")
-            
-            for theme_name in themes:
-                current_step += 1
-                output_file = self.generate_filename(city, theme_name, timestamp)
+            def handle_result(theme_name, result):
+                """Report a finished theme through the callbacks."""
+                results.append(result)
                 
-                logger.info(f"[{current_step-2}/{len(themes)}] Starting render: {theme_name}")
+                if progress_callback:
+                    status_msg = "✓" if result['status'] == 'success' else "✗"
+                    progress_callback(
+                        len(results) + 2,
+                        total_steps,
+                        f"{status_msg} Rendered {theme_name}"
+                    )
                 
-                # Update job to show rendering
+                # Update job progress based on result
                 if job_progress_callback:
-                    job_progress_callback(theme_name, f"Rendering {theme_name}...", 65)
+                    if result['status'] == 'success':
+                        job_progress_callback(theme_name, f"Complete! {theme_name}", 100)
+                    else:
+                        job_progress_callback(theme_name, f"Failed: {result.get('error', 'Unknown error')}", 100)
+                
+                # Hand the result to the callback thread for incremental processing
+                if dispatcher:
+                    dispatcher.put(result)
+                
+                if result['status'] == 'success':
+                    logger.info(f"Theme '{theme_name}' rendered successfully in {result.get('render_time', 0):.2f}s")
+                    logger.info(f"  File: {result['filename']} ({result['file_size'] / 1024 / 1024:.2f} MB)")
+                else:
+                    logger.error(f"Theme '{theme_name}' failed: {result.get('error', 'Unknown error')}")
+            
+            def handle_error(theme_name, e):
+                """Record a theme that failed to load or raised outside _render_single_theme."""
+                error_msg = f"Unexpected error rendering {theme_name}: {str(e)}"
+                logger.exception(error_msg)
+                results.append({
+                    'status': 'error',
+                    'theme': theme_name,
+                    'error': error_msg
+                })
                 
+                if progress_callback:
+                    progress_callback(len(results) + 2, total_steps, f"✗ Error rendering {theme_name}")
+            
+            # Load every theme up front so renders never touch the themes
+            # directory; a broken theme fails on its own, not the whole batch
+            loaded_themes = {}
+            for theme_name in dict.fromkeys(themes):
                 try:
-                    result = self._render_single_theme(
-                        map_data=map_data,
-                        theme_name=theme_name,
-                        city=city,
-                        country=country,
-                        point=point,
-                        output_file=output_file,
-                        width_inches=width_inches,
-                        height_inches=height_inches,
-                        dpi=dpi
+                    loaded_themes[theme_name] = load_theme(theme_name)
+                except Exception as e:
+                    handle_error(theme_name, e)
+            
+            render_args = {
+                theme_name: (
+                    theme_name, theme, city, country, point,
+                    self.generate_filename(city, theme_name, timestamp),
+                    width_inches, height_inches, dpi
+                )
+                for theme_name, theme in loaded_themes.items()
+            }
+            
+            # Step 3: Render themes. matplotlib is not thread-safe, so parallel
+            # renders run in separate processes; previews and single themes
+            # stay in-process where pool startup would dominate
+            pool = None
+            map_data_path = None
+            pool_size = min(self.max_render_workers, len(render_args))
+            if pool_size > 1 and not preview_mode:
+                if multiprocessing.current_process().daemon:
+                    # e.g. inside a Celery prefork child, which cannot have children
+                    logger.info("Running in a daemonic process, rendering sequentially")
+                else:
+                    map_data_path = _spill_map_data(map_data)
+                    pool = ProcessPoolExecutor(
+                        max_workers=pool_size,
+                        mp_context=_render_mp_context(),
+                        initializer=_init_render_worker,
+                        initargs=(map_data_path,)
                     )
-                    results.append(result)
-                    
-                    if progress_callback:
-                        status_msg = "✓" if result['status'] == 'success' else "✗"
-                        progress_callback(
-                            current_step,
-                            total_steps,
-                            f"{status_msg} Rendered {theme_name}"
-                        )
-                    
-                    # Update job progress based on result
-                    if job_progress_callback:
-                        if result['status'] == 'success':
-                            job_progress_callback(theme_name, f"Complete! {theme_name}", 100)
-                        else:
-                            job_progress_callback(theme_name, f"Failed: {result.get('error', 'Unknown error')}", 100)
-                    
-                    # Call result callback immediately for incremental processing
-                    if result_callback:
+            
+            if pool is not None:
+                logger.info(f"Rendering {len(render_args)} themes in {pool_size} processes")
+                try:
+                    with pool:
+                        futures = {}
+                        for theme_name, args in render_args.items():
+                            if job_progress_callback:
+                                job_progress_callback(theme_name, f"Rendering {theme_name}...", 65)
+                            futures[pool.submit(_render_theme_in_worker, *args)] = theme_name
+                        
+                        for future in as_completed(futures):
+                            theme_name = futures[future]
+                            try:
+                                handle_result(theme_name, future.result())
+                            except Exception as e:
+                                handle_error(theme_name, e)
+                finally:
+                    if map_data_path is not None:
+                        os.unlink(map_data_path)
+            else:
+                logger.info(f"Rendering {len(render_args)} themes sequentially")
+                
+                # Each PNG is encoded in memory and written to disk on a
+                # background thread while the next theme renders; a result
+                # is reported only once its file has been written
+                pending_write = None
+                
+                def finish_write():
+                    theme_name, result, future = pending_write
+                    try:
+                        future.result()
+                    except OSError as e:
+                        handle_error(theme_name, e)
+                    else:
+                        handle_result(theme_name, result)
+                
+                with ThreadPoolExecutor(max_workers=1, thread_name_prefix='poster-writer') as writer:
+                    for index, (theme_name, args) in enumerate(render_args.items(), start=1):
+                        logger.info(f"[{index}/{len(render_args)}] Starting render: {theme_name}")
+                        
+                        # Update job to show rendering
+                        if job_progress_callback:
+                            job_progress_callback(theme_name, f"Rendering {theme_name}...", 65)
+                        
+                        buffer = io.BytesIO()
                         try:
-                            result_callback(result)
+                            result = _render_single_theme(map_data, *args, buffer=buffer)
                         except Exception as e:
-                            logger.error(f"Error in result callback for theme {theme_name}: {e}")
-                    
-                    if result['status'] == 'success':
-                        logger.info(f"Theme '{theme_name}' rendered successfully in {result.get('render_time', 0):.2f}s")
-                        logger.info(f"  File: {result['filename']} ({result['file_size'] / 1024 / 1024:.2f} MB)")
-                    else:
-                        logger.error(f"Theme '{theme_name}' failed: {result.get('error', 'Unknown error')}")
-                    
-                except Exception as e:
-                    # Handle any unexpected errors
-                    error_msg = f"Unexpected error rendering {theme_name}: {str(e)}"
-                    logger.error(error_msg)
-                    logger.error(traceback.format_exc())
-                    results.append({
-                        'status': 'error',
-                        'theme': theme_name,
-                        'error': error_msg
-                    })
+                            result = None
+                            handle_error(theme_name, e)
+                        
+                        if pending_write:
+                            finish_write()
+                            pending_write = None
+                        
+                        if result is None:
+                            continue
+                        if result['status'] == 'success':
+                            write = writer.submit(_write_poster_file, result['file_path'], buffer)
+                            pending_write = (theme_name, result, write)
+                        else:
+                            handle_result(theme_name, result)
                     
-                    if progress_callback:
-                        progress_callback(current_step, total_steps, f"✗ Error rendering {theme_name}")
+                    if pending_write:
+                        finish_write()
             
             # Final summary
             success_count = sum(1 for r in results if r['status'] == 'success')
@@ -238,8 +470,7 @@ class BatchPosterGenerator:
         except Exception as e:
             # Handle errors in geocoding or data fetching
             error_msg = f"Batch generation failed: {str(e)}"
-            logger.error(error_msg)
-            logger.error(traceback.format_exc())
+            logger.exception(error_msg)
             
             # Return error results for all themes
             for theme_name in themes:
@@ -252,108 +483,104 @@ class BatchPosterGenerator:
             if progress_callback:
                 progress_callback(current_step, total_steps, f"✗ {error_msg}")
         
+        finally:
+            if dispatcher:
+                dispatcher.close()
+        
         return results
+
+
+def _render_single_theme(
+    map_data: Dict,
+    theme_name: str,
+    theme: Dict,
+    city: str,
+    country: str,
+    point: Tuple[float, float],
+    output_file: str,
+    width_inches: float = 12.0,
+    height_inches: float = 16.0,
+    dpi: int = 300,
+    buffer: Optional[io.BytesIO] = None
+) -> Dict:
+    """
+    Render a single theme from pre-fetched map data.
     
-    def _render_single_theme(
-        self,
-        map_data: Dict,
-        theme_name: str,
-        city: str,
-        country: str,
-        point: Tuple[float, float],
-        output_file: str,
-        width_inches: float = 12.0,
-        height_inches: float = 16.0,
-        dpi: int = 300
-    ) -> Dict:
-        """
-        Helper method to render a single theme.
+    Module-level so it can run in a process pool worker. Each call is
+    isolated and handles its own errors. With ``buffer`` the PNG is encoded
+    into it and the caller is responsible for writing it to ``output_file``.
+    
+    Args:
+        map_data: Pre-fetched map data dictionary
+        theme_name: Name of theme to render
+        theme: Theme dictionary loaded for theme_name
+        city: City name
+        country: Country name
+        point: (latitude, longitude) tuple
+        output_file: Path where poster will be saved
+        width_inches: Width of poster in inches
+        height_inches: Height of poster in inches
+        dpi: DPI resolution
+        buffer: Optional in-memory target for the encoded PNG
         
-        This method is designed to be called in parallel by ThreadPoolExecutor.
-        Each call is isolated and handles its own errors.
+    Returns:
+        Result dictionary with status, filename, or error information
+    """
+    start_time = time.monotonic()
+    
+    try:
+        # Render poster
+        logger.info(f"Rendering {theme_name} to {output_file} at {width_inches}\"x{height_inches}\" @ {dpi} DPI")
+        fig = _checkout_figure(width_inches, height_inches, dpi)
+        rendered = render_poster(
+            map_data=map_data,
+            theme=theme,
+            city=city,
+            country=country,
+            point=point,
+            output_file=output_file if buffer is None else buffer,
+            width_inches=width_inches,
+            height_inches=height_inches,
+            dpi=dpi,
+            fig=fig
+        )
+        # Only a figure that rendered cleanly goes back to the pool
+        _release_figure(fig, width_inches, height_inches, dpi)
         
-        Args:
-            map_data: Pre-fetched map data dictionary
-            theme_name: Name of theme to render
-            city: City name
-            country: Country name
-            point: (latitude, longitude) tuple
-            output_file: Path where poster will be saved
-            width_inches: Width of poster in inches
-            height_inches: Height of poster in inches
-            dpi: DPI resolution
-            
-        Returns:
-            Result dictionary with status, filename, or error information
-        """
-        start_time = datetime.now()
+        # render_poster reports size and dimensions, so the file is not touched again
+        if rendered['file_size'] is None:
+            raise FileNotFoundError(f"Output file was not created: {output_file}")
         
-        try:
-            # Load theme
-            logger.info(f"Loading theme: {theme_name}")
-            theme = load_theme(theme_name)
-            
-            # Render poster
-            logger.info(f"Rendering {theme_name} to {output_file} at {width_inches}\"x{height_inches}\" @ {dpi} DPI")
-            render_poster(
-                map_data=map_data,
-                theme=theme,
-                city=city,
-                country=country,
-                point=point,
-                output_file=output_file,
-                width_inches=width_inches,
-                height_inches=height_inches,
-                dpi=dpi
-            )
-            
-            # Verify file was created
-            if not os.path.exists(output_file):
-                raise FileNotFoundError(f"Output file was not created: {output_file}")
-            
-            # Get file info and dimensions
-            file_size = os.path.getsize(output_file)
-            render_time = (datetime.now() - start_time).total_seconds()
-            
-            # Calculate pixel dimensions
-            width = int(width_inches * dpi)
-            height = int(height_inches * dpi)
-            
-            # Try to get actual dimensions from image file
-            try:
-                from PIL import Image
-                with Image.open(output_file) as img:
-                    width, height = img.size
-                    logger.info(f"Image dimensions: {width}x{height}")
-            except Exception as e:
-                logger.warning(f"Could not read image dimensions, using calculated: {e}")
-            
-            result = {
-                'status': 'success',
-                'theme': theme_name,
-                'filename': os.path.basename(output_file),
-                'file_path': os.path.abspath(output_file),
-                'file_size': file_size,
-                'width': width,
-                'height': height,
-                'render_time': render_time
-            }
-            
-            logger.info(f"Theme '{theme_name}' rendered successfully in {render_time:.2f}s ({width}x{height})")
-            return result
-            
-        except Exception as e:
-            render_time = (datetime.now() - start_time).total_seconds()
-            error_msg = f"Error rendering theme '{theme_name}': {str(e)}"
-            logger.error(error_msg)
-            logger.error(traceback.format_exc())
-            
-            return {
-                'status': 'error',
-                'theme': theme_name,
-                'error': error_msg,
-                'render_time': render_time
-            }
+        file_size = rendered['file_size']
+        width = rendered['width']
+        height = rendered['height']
+        render_time = time.monotonic() - start_time
+        
+        result = {
+            'status': 'success',
+            'theme': theme_name,
+            'filename': os.path.basename(output_file),
+            'file_path': os.path.abspath(output_file),
+            'file_size': file_size,
+            'width': width,
+            'height': height,
+            'render_time': render_time
+        }
+        
+        logger.info(f"Theme '{theme_name}' rendered successfully in {render_time:.2f}s ({width}x{height})")
+        return result
+        
+    except Exception as e:
+        render_time = time.monotonic() - start_time
+        error_msg = f"Error rendering theme '{theme_name}': {str(e)}"
+        logger.exception(error_msg)
+        
+        return {
+            'status': 'error',
+            'theme': theme_name,
+            'error': error_msg,
+            'render_time': render_time
+        }
 
 
 def create_batch_posters(city: str, country: str, themes: List[str], **kwargs) -> List[Dict]:
@@ -398,6 +625,7 @@ def create_batch_posters(city: str, country: str, themes: List[str], **kwargs) -
 if __name__ == '__main__':
     # Simple CLI for testing batch generation
     import argparse
+    import sys
     
     parser = argparse.ArgumentParser(
         description='Generate multiple themed posters efficiently',
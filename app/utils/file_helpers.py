@@ -7,12 +7,56 @@ for consistent file handling across CLI and web application.
 
 import os
 import logging
-from datetime import datetime
-from typing import Optional, Tuple, List
+import multiprocessing
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Set, Tuple, List
 from PIL import Image
 
+try:
+    import pyvips
+except (ImportError, OSError):  # pragma: no cover - pyvips/libvips are optional
+    pyvips = None
+
 logger = logging.getLogger(__name__)
 
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Thumbnails are lossy WebP: several times smaller than PNG at this size
+# and faster to encode. method/effort 4 balances speed against file size
+THUMBNAIL_EXTENSION = '.webp'
+THUMBNAIL_WEBP_QUALITY = 85
+THUMBNAIL_WEBP_METHOD = 4
+THUMBNAIL_REDUCING_GAP = 2.0
+
+
+# Single-pass slug translations for filename parts
+_CITY_SLUG_TABLE = str.maketrans(' -', '__')
+_SPACE_SLUG_TABLE = str.maketrans(' ', '_')
+
+# Last formatted filename timestamp as (epoch second, string); every poster
+# started within the same second reuses the string instead of re-formatting
+_timestamp_cache: Tuple[int, str] = (-1, '')
+
+
+def current_timestamp() -> str:
+    """
+    Return the local time as a filename timestamp, formatted at most once per second.
+    
+    Returns:
+        Timestamp string in format YYYYMMDD_HHMMSS
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached = _timestamp_cache
+    if now != cached_second:
+        t = time.localtime(now)
+        cached = (f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_"
+                  f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}")
+        _timestamp_cache = (now, cached)
+    return cached
+
 
 def generate_poster_filename(city: str, theme: str, timestamp: str = None) -> str:
     """
@@ -33,22 +77,30 @@ def generate_poster_filename(city: str, theme: str, timestamp: str = None) -> st
         'san_francisco_sunset_20260101_120000.png'
     """
     # Slugify city name: lowercase, replace spaces with underscores
-    city_slug = city.lower().replace(' ', '_').replace('-', '_')
+    city_slug = city.translate(_CITY_SLUG_TABLE).lower()
     
     # Generate timestamp if not provided
     if timestamp is None:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = current_timestamp()
     
     # Ensure theme is lowercase for consistency
-    theme_slug = theme.lower().replace(' ', '_')
+    theme_slug = theme.translate(_SPACE_SLUG_TABLE).lower()
     
     return f"{city_slug}_{theme_slug}_{timestamp}.png"
 
 
+# Directories already created or verified by this process
+_ensured_dirs: Set[str] = set()
+
+
 def ensure_directory(path: str) -> str:
     """
     Create directory if it doesn't exist.
     
+    Each path is only created once per process; later calls return without
+    a syscall. A directory removed while the process runs surfaces as an
+    error on the next write into it.
+    
     Args:
         path: Directory path to create
         
@@ -58,8 +110,12 @@ def ensure_directory(path: str) -> str:
     Raises:
         OSError: If directory creation fails due to permissions or other errors
     """
+    if path in _ensured_dirs:
+        return path
+    
     try:
         os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
         logger.debug(f"Ensured directory exists: {path}")
         return path
     except OSError as e:
@@ -102,17 +158,17 @@ def get_thumbnail_path(poster_path: str, thumbnail_dir: str = None) -> str:
         
     Examples:
         >>> get_thumbnail_path("posters/new_york_noir.png")
-        'posters/new_york_noir_thumb.png'
+        'posters/new_york_noir_thumb.webp'
         >>> get_thumbnail_path("posters/paris_sunset.png", "thumbnails")
-        'thumbnails/paris_sunset_thumb.png'
+        'thumbnails/paris_sunset_thumb.webp'
     """
     # Split path into directory, filename, and extension
     dir_name = os.path.dirname(poster_path)
     base_name = os.path.basename(poster_path)
-    name, ext = os.path.splitext(base_name)
+    name, _ = os.path.splitext(base_name)
     
     # Generate thumbnail filename with _thumb suffix
-    thumbnail_filename = f"{name}_thumb{ext}"
+    thumbnail_filename = f"{name}_thumb{THUMBNAIL_EXTENSION}"
     
     # Use specified thumbnail directory or same as poster
     if thumbnail_dir:
@@ -125,15 +181,22 @@ def get_thumbnail_path(poster_path: str, thumbnail_dir: str = None) -> str:
 def generate_thumbnail(
     source_path: str,
     thumbnail_path: str = None,
-    size: Tuple[int, int] = (400, 533)
+    size: Tuple[int, int] = (400, 533),
+    force: bool = False
 ) -> str:
     """
     Generate thumbnail from poster image.
     
+    Uses libvips (pyvips) when available, which shrinks while decoding and
+    never holds the full-size poster in memory; falls back to PIL otherwise.
+    Thumbnails are written as opaque WebP unless ``thumbnail_path`` names
+    another extension, in which case PNG is written.
+    
     Args:
         source_path: Path to the source poster image
         thumbnail_path: Optional path for thumbnail. If None, auto-generated
         size: Thumbnail size as (width, height). Default: (400, 533)
+        force: Regenerate even if an up-to-date thumbnail already exists
         
     Returns:
         Path to the generated thumbnail
@@ -144,12 +207,14 @@ def generate_thumbnail(
         
     Examples:
         >>> generate_thumbnail("posters/paris_noir.png")
-        'posters/paris_noir_thumb.png'
+        'posters/paris_noir_thumb.webp'
         >>> generate_thumbnail("posters/tokyo.png", "thumbs/tokyo_small.png", (200, 266))
         'thumbs/tokyo_small.png'
     """
     # Check if source file exists
-    if not os.path.exists(source_path):
+    try:
+        source_mtime = os.stat(source_path).st_mtime
+    except FileNotFoundError:
         error_msg = f"Source image not found: {source_path}"
         logger.error(error_msg)
         raise FileNotFoundError(error_msg)
@@ -158,20 +223,57 @@ def generate_thumbnail(
     if thumbnail_path is None:
         thumbnail_path = get_thumbnail_path(source_path)
     
+    # Make-style skip: a non-empty thumbnail newer than its poster is current
+    if not force and _is_up_to_date(thumbnail_path, source_mtime):
+        logger.debug(f"Thumbnail up to date, skipping: {thumbnail_path}")
+        return thumbnail_path
+    
+    # Ensure directory exists for thumbnail
+    thumb_dir = os.path.dirname(thumbnail_path)
+    if thumb_dir:
+        ensure_directory(thumb_dir)
+    
+    as_webp = thumbnail_path.lower().endswith('.webp')
+    
+    if pyvips is not None:
+        try:
+            logger.info(f"Generating thumbnail for {source_path} (libvips)")
+            thumb = pyvips.Image.thumbnail(source_path, size[0], height=size[1], size='down')
+            if as_webp:
+                # Posters are opaque, so the alpha channel is dead weight
+                if thumb.hasalpha():
+                    thumb = thumb.flatten()
+                thumb.webpsave(thumbnail_path, Q=THUMBNAIL_WEBP_QUALITY, effort=THUMBNAIL_WEBP_METHOD)
+            else:
+                thumb.pngsave(thumbnail_path, compression=9)
+            logger.info(f"Thumbnail generated: {thumbnail_path}")
+            return thumbnail_path
+        except pyvips.Error as e:
+            logger.warning(f"libvips thumbnail failed for {source_path}, falling back to PIL: {e}")
+    
     try:
         # Open and process image
         logger.info(f"Generating thumbnail for {source_path}")
         with Image.open(source_path) as img:
-            # Maintain aspect ratio while resizing
-            img.thumbnail(size, Image.Resampling.LANCZOS)
+            # Let the decoder downscale where it can (JPEG DCT scaling)
+            img.draft('RGB', size)
             
-            # Ensure directory exists for thumbnail
-            thumb_dir = os.path.dirname(thumbnail_path)
-            if thumb_dir:
-                ensure_directory(thumb_dir)
+            # Maintain aspect ratio while resizing. reducing_gap box-reduces by
+            # an integer factor first (8x for a 300 DPI poster), leaving Lanczos
+            # only the last <2x step; 2.0 is visually indistinguishable from a
+            # full Lanczos pass
+            img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=THUMBNAIL_REDUCING_GAP)
             
-            # Save optimized PNG
-            img.save(thumbnail_path, 'PNG', optimize=True)
+            if as_webp:
+                # Posters are opaque, so the alpha channel is dead weight
+                img.convert('RGB').save(
+                    thumbnail_path, 'WEBP',
+                    quality=THUMBNAIL_WEBP_QUALITY, method=THUMBNAIL_WEBP_METHOD
+                )
+            else:
+                # A fast zlib level: optimize=True roughly doubles encode time
+                # for a few percent on a file this small
+                img.save(thumbnail_path, 'PNG', compress_level=3)
             logger.info(f"Thumbnail generated: {thumbnail_path}")
             
         return thumbnail_path
@@ -186,16 +288,30 @@ def generate_thumbnail(
         raise
 
 
+def _is_up_to_date(thumbnail_path: str, source_mtime: float) -> bool:
+    """Return True if the thumbnail exists, is non-empty and is newer than its source."""
+    try:
+        st = os.stat(thumbnail_path)
+    except OSError:
+        return False
+    return st.st_size > 0 and st.st_mtime >= source_mtime
+
+
 def generate_thumbnails_batch(
     poster_paths: List[str],
-    size: Tuple[int, int] = (400, 533)
+    size: Tuple[int, int] = (400, 533),
+    force: bool = False
 ) -> List[Tuple[str, Optional[str], bool]]:
     """
     Generate thumbnails for multiple posters.
     
+    Posters whose thumbnail is already newer than the poster are skipped
+    unless ``force`` is set.
+    
     Args:
         poster_paths: List of paths to poster images
         size: Thumbnail size as (width, height). Default: (400, 533)
+        force: Regenerate every thumbnail, even up-to-date ones
         
     Returns:
         List of tuples: (poster_path, thumbnail_path, success)
@@ -208,18 +324,37 @@ def generate_thumbnails_batch(
         ...     if success:
         ...         print(f"Generated: {thumb}")
     """
-    results = []
-    
     logger.info(f"Starting batch thumbnail generation for {len(poster_paths)} posters")
     
+    # Resolve up-to-date thumbnails here so only stale ones are scheduled
+    results = {}
+    pending = []
     for poster_path in poster_paths:
-        try:
-            thumbnail_path = generate_thumbnail(poster_path, size=size)
-            results.append((poster_path, thumbnail_path, True))
-            logger.debug(f"Success: {poster_path} -> {thumbnail_path}")
-        except (FileNotFoundError, IOError, Exception) as e:
-            logger.warning(f"Failed to generate thumbnail for {poster_path}: {e}")
-            results.append((poster_path, None, False))
+        if not force:
+            thumbnail_path = get_thumbnail_path(poster_path)
+            try:
+                if _is_up_to_date(thumbnail_path, os.stat(poster_path).st_mtime):
+                    results[poster_path] = (poster_path, thumbnail_path, True)
+                    continue
+            except OSError:
+                pass  # Missing poster: let the worker report the failure
+        pending.append(poster_path)
+    
+    if len(pending) < len(poster_paths):
+        logger.info(f"Skipping {len(poster_paths) - len(pending)} up-to-date thumbnails")
+    
+    # Resizing and encoding are CPU-bound, so spread posters over processes;
+    # daemonic processes (e.g. Celery prefork children) cannot have children
+    max_workers = min(os.cpu_count() or 1, len(pending))
+    if max_workers > 1 and not multiprocessing.current_process().daemon:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            generated = pool.map(_thumbnail_worker, pending, [size] * len(pending), [force] * len(pending))
+            results.update((result[0], result) for result in generated)
+    else:
+        results.update((path, _thumbnail_worker(path, size, force)) for path in pending)
+    
+    # Keep the input order
+    results = [results[poster_path] for poster_path in poster_paths]
     
     # Log summary
     successful = sum(1 for _, _, success in results if success)
@@ -228,6 +363,18 @@ def generate_thumbnails_batch(
     return results
 
 
+def _thumbnail_worker(poster_path: str, size: Tuple[int, int],
+                      force: bool = False) -> Tuple[str, Optional[str], bool]:
+    """Generate one thumbnail for generate_thumbnails_batch, never raising."""
+    try:
+        thumbnail_path = generate_thumbnail(poster_path, size=size, force=force)
+        logger.debug(f"Success: {poster_path} -> {thumbnail_path}")
+        return poster_path, thumbnail_path, True
+    except Exception as e:
+        logger.warning(f"Failed to generate thumbnail for {poster_path}: {e}")
+        return poster_path, None, False
+
+
 # Utility function for checking if thumbnail exists
 def thumbnail_exists(poster_path: str, thumbnail_dir: str = None) -> bool:
     """
@@ -244,6 +391,29 @@ def thumbnail_exists(poster_path: str, thumbnail_dir: str = None) -> bool:
     return os.path.exists(thumbnail_path)
 
 
+# Utility function for reading PNG dimensions
+def read_png_dimensions(path: str) -> Tuple[int, int]:
+    """
+    Read width and height from a PNG's IHDR chunk without decoding the image.
+    
+    Args:
+        path: Path to the PNG file
+        
+    Returns:
+        (width, height) in pixels
+        
+    Raises:
+        ValueError: If the file is not a PNG
+        OSError: If the file cannot be read
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    # 8-byte signature, then IHDR length and type, then width and height
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        raise ValueError(f"Not a PNG file: {path}")
+    return struct.unpack('>II', header[16:24])
+
+
 # Utility function for getting file size
 def get_file_size(path: str) -> int:
     """
@@ -4,6 +4,70 @@ from typing import Dict, Tuple, Optional
 from flask import current_app
 
 
+class _FormatTables:
+    """
+    Lookup tables built from an app's static page format configuration.
+    
+    Per-request calls become plain dict probes instead of config lookups and
+    orientation arithmetic. One instance lives in each app's extensions, so
+    apps with different format configs do not share tables.
+    """
+    
+    def __init__(self, config):
+        formats = config['PAGE_FORMATS']
+        dimensions: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        display_names: Dict[Tuple[str, str], str] = {}
+        for format_id, format_config in formats.items():
+            name = format_config['name']
+            display_names[(format_id, 'portrait')] = f"{name} (Portrait)"
+            display_names[(format_id, 'landscape')] = (
+                f"{name} (Landscape)" if format_config.get('orientable', True) else name
+            )
+            
+            if format_id == 'custom':
+                continue
+            width = format_config['width_inches']
+            height = format_config['height_inches']
+            short_side, long_side = (width, height) if width <= height else (height, width)
+            dimensions[(format_id, 'portrait')] = (short_side, long_side)
+            dimensions[(format_id, 'landscape')] = (long_side, short_side)
+        
+        self.format_dimensions = dimensions
+        self.pixel_dimensions: Dict[Tuple[str, str, int], Tuple[int, int]] = {
+            (format_id, orientation, dpi): calculate_output_dimensions(width, height, dpi)
+            for (format_id, orientation), (width, height) in dimensions.items()
+            for dpi in config['DPI_OPTIONS']
+        }
+        self.format_ids = frozenset(formats)
+        self.format_names = {format_id: format_config['name'] for format_id, format_config in formats.items()}
+        self.display_names = display_names
+        self.page_size_limits = (config['MIN_PAGE_SIZE_INCHES'], config['MAX_PAGE_SIZE_INCHES'])
+        self.valid_dpis = frozenset(config['DPI_OPTIONS'])
+        self.invalid_dpi_message = f"DPI must be one of: {list(config['DPI_OPTIONS'])}"
+
+
+def init_format_helpers(app) -> None:
+    """
+    Build the format lookup tables from an app's configuration.
+    
+    Called once by the app factory; functions in this module build them
+    lazily for ``current_app`` if it has not run.
+    
+    Args:
+        app: Flask application whose config holds PAGE_FORMATS
+    """
+    app.extensions['format_helpers'] = _FormatTables(app.config)
+
+
+def _tables() -> _FormatTables:
+    """Return the current app's lookup tables, building them if needed."""
+    tables = current_app.extensions.get('format_helpers')
+    if tables is None:
+        init_format_helpers(current_app)
+        tables = current_app.extensions['format_helpers']
+    return tables
+
+
 def get_format_dimensions(
     format_id: str,
     orientation: str = 'portrait',
@@ -25,38 +89,36 @@ def get_format_dimensions(
     Raises:
         ValueError: If format is invalid or custom dimensions missing
     """
-    formats = current_app.config['PAGE_FORMATS']
+    tables = _tables()
+    
+    # Anything but 'landscape' is treated as portrait
+    orientation = 'landscape' if orientation == 'landscape' else 'portrait'
+    dimensions = tables.format_dimensions.get((format_id, orientation))
+    if dimensions is not None:
+        return dimensions
     
-    if format_id not in formats:
+    if format_id not in tables.format_ids:
         raise ValueError(f"Unknown format: {format_id}")
     
-    format_config = formats[format_id]
+    # Only the custom format is left
+    if custom_width is None or custom_height is None:
+        raise ValueError("Custom format requires width and height")
     
-    if format_id == 'custom':
-        if custom_width is None or custom_height is None:
-            raise ValueError("Custom format requires width and height")
-        
-        # Validate custom dimensions
-        min_size = current_app.config['MIN_PAGE_SIZE_INCHES']
-        max_size = current_app.config['MAX_PAGE_SIZE_INCHES']
-        
-        if not (min_size <= custom_width <= max_size):
-            raise ValueError(f"Width must be between {min_size} and {max_size} inches")
-        if not (min_size <= custom_height <= max_size):
-            raise ValueError(f"Height must be between {min_size} and {max_size} inches")
-        
-        width, height = custom_width, custom_height
-    else:
-        width = format_config['width_inches']
-        height = format_config['height_inches']
+    # Validate custom dimensions
+    min_size, max_size = tables.page_size_limits
     
-    # Apply orientation
-    if orientation == 'landscape':
-        width, height = max(width, height), min(width, height)
-    else:  # portrait
-        width, height = min(width, height), max(width, height)
+    if not (min_size <= custom_width <= max_size):
+        raise ValueError(f"Width must be between {min_size} and {max_size} inches")
+    if not (min_size <= custom_height <= max_size):
+        raise ValueError(f"Height must be between {min_size} and {max_size} inches")
     
-    return width, height
+    # Apply orientation: one comparison instead of paired min/max calls
+    short_side, long_side = (
+        (custom_width, custom_height) if custom_width <= custom_height else (custom_height, custom_width)
+    )
+    if orientation == 'landscape':
+        return long_side, short_side
+    return short_side, long_side
 
 
 def validate_dpi(dpi: int) -> int:
@@ -72,9 +134,10 @@ def validate_dpi(dpi: int) -> int:
     Raises:
         ValueError: If DPI is invalid
     """
-    valid_dpis = current_app.config['DPI_OPTIONS'].keys()
-    if dpi not in valid_dpis:
-        raise ValueError(f"DPI must be one of: {list(valid_dpis)}")
+    tables = _tables()
+    
+    if dpi not in tables.valid_dpis:
+        raise ValueError(tables.invalid_dpi_message)
     return dpi
 
 
@@ -95,6 +158,41 @@ def calculate_output_dimensions(width_inches: float, height_inches: float, dpi:
     return width_px, height_px
 
 
+def get_output_dimensions(
+    format_id: str,
+    orientation: str,
+    dpi: int,
+    custom_width: Optional[float] = None,
+    custom_height: Optional[float] = None
+) -> Tuple[int, int]:
+    """
+    Get output pixel dimensions for a format at a DPI.
+    
+    Standard formats at configured DPIs come from a precomputed table;
+    anything else is resolved and calculated.
+    
+    Args:
+        format_id: Format identifier (e.g., 'a4', 'classic', 'custom')
+        orientation: 'portrait' or 'landscape'
+        dpi: DPI resolution
+        custom_width: Width in inches for custom format
+        custom_height: Height in inches for custom format
+        
+    Returns:
+        Tuple of (width_pixels, height_pixels)
+        
+    Raises:
+        ValueError: If format is invalid or custom dimensions missing
+    """
+    orientation = 'landscape' if orientation == 'landscape' else 'portrait'
+    pixels = _tables().pixel_dimensions.get((format_id, orientation, dpi))
+    if pixels is not None:
+        return pixels
+    
+    width_inches, height_inches = get_format_dimensions(format_id, orientation, custom_width, custom_height)
+    return calculate_output_dimensions(width_inches, height_inches, dpi)
+
+
 def get_format_display_name(format_id: str, orientation: str = 'portrait') -> str:
     """
     Get human-readable format name.
@@ -106,14 +204,13 @@ def get_format_display_name(format_id: str, orientation: str = 'portrait') -> st
     Returns:
         Display name string
     """
-    formats = current_app.config['PAGE_FORMATS']
-    if format_id not in formats:
-        return f"Unknown ({format_id})"
+    tables = _tables()
     
-    name = formats[format_id]['name']
-    if orientation == 'landscape' and formats[format_id].get('orientable', True):
-        name += " (Landscape)"
-    elif orientation == 'portrait':
-        name += " (Portrait)"
+    display_name = tables.display_names.get((format_id, orientation))
+    if display_name is not None:
+        return display_name
     
-    return name
\ No newline at end of file
+    # Unrecognized orientation: plain format name
+    if format_id in tables.format_names:
+        return tables.format_names[format_id]
+    return f"Unknown ({format_id})"
\ No newline at end of file
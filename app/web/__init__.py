@@ -1,32 +1,44 @@
 """Web interface blueprint."""
 
-from flask import Blueprint, render_template, session, request
-from app.services.theme_service import ThemeService
+from datetime import datetime
+from flask import Blueprint, abort, render_template, session, request
+from sqlalchemy.orm import load_only
+from app.extensions import db
+from app.services.poster_service import PosterService
+from app.services.theme_service import current_theme_service
 from app.models import Poster
-import uuid
 
 web_bp = Blueprint('web', __name__)
 
+GALLERY_PAGE_SIZE = 12
+
+# Poster columns read by gallery.html; the rest (file paths, format
+# details, ownership) stay unloaded. Extend this when the template starts
+# using another field, or it will lazy-load per row
+_GALLERY_POSTER_COLUMNS = (
+    Poster.id, Poster.city, Poster.country, Poster.theme, Poster.file_size, Poster.created_at,
+)
+
 
 @web_bp.route('/')
 def index():
     """Home page with quick create form."""
-    theme_service = ThemeService()
-    themes = theme_service.get_all_themes()
-    return render_template('index.html', themes=themes[:6])  # Show first 6 themes
+    theme_service = current_theme_service._get_current_object()
+    return render_template('index.html', themes=theme_service.get_featured_themes())
 
 
 @web_bp.route('/create')
 def create():
     """Full poster creation form."""
-    theme_service = ThemeService()
+    theme_service = current_theme_service._get_current_object()
     themes = theme_service.get_all_themes()
     
     # Get optional query parameters for pre-filling
-    city = request.args.get('city', '')
-    country = request.args.get('country', '')
-    distance = request.args.get('distance', type=int)
-    theme = request.args.get('theme', '')
+    args = request.args
+    city = args.get('city', '')
+    country = args.get('country', '')
+    distance = args.get('distance', type=int)
+    theme = args.get('theme', '')
     
     return render_template('create.html',
                          themes=themes,
@@ -39,27 +51,32 @@ def create():
 @web_bp.route('/themes')
 def themes():
     """Theme gallery page."""
-    theme_service = ThemeService()
+    theme_service = current_theme_service._get_current_object()
     all_themes = theme_service.get_all_themes()
     return render_template('themes.html', themes=all_themes)
 
 
-@web_bp.route('/generate/<job_id>')
+# IDs are UUIDs; the uuid converter turns malformed ones into a 404 at
+# routing time, before any view code or database query runs
+
+@web_bp.route('/generate/<uuid:job_id>')
 def progress(job_id):
     """Job progress tracking page."""
-    return render_template('progress.html', job_id=job_id)
+    return render_template('progress.html', job_id=str(job_id))
 
 
-@web_bp.route('/batch/<batch_id>')
+@web_bp.route('/batch/<uuid:batch_id>')
 def batch_progress(batch_id):
     """Batch poster generation progress tracking page."""
-    return render_template('batch_progress.html', batch_id=batch_id)
+    return render_template('batch_progress.html', batch_id=str(batch_id))
 
 
-@web_bp.route('/posters/<poster_id>')
+@web_bp.route('/posters/<uuid:poster_id>')
 def poster_detail(poster_id):
     """Poster detail/result page."""
-    poster = Poster.query.get_or_404(poster_id)
+    poster = PosterService().get_poster_view(str(poster_id))
+    if poster is None:
+        abort(404)
     return render_template('result.html', poster=poster)
 
 
@@ -69,14 +86,45 @@ def gallery():
     # Get session ID
     session_id = session.get('session_id')
     
-    if not session_id:
-        posters = []
-    else:
-        # Get user's posters
-        page = request.args.get('page', 1, type=int)
-        pagination = Poster.query.filter_by(session_id=session_id)\
-            .order_by(Poster.created_at.desc())\
-            .paginate(page=page, per_page=12, error_out=False)
-        posters = pagination.items
+    posters = []
+    next_cursor = None
+    
+    if session_id:
+        # Keyset pagination: one indexed query per page, no COUNT(*). The
+        # cursor is the (created_at, id) of the last poster already shown
+        query = (
+            db.select(Poster)
+            .options(load_only(*_GALLERY_POSTER_COLUMNS))
+            .where(Poster.session_id == session_id)
+        )
+        
+        cursor = _parse_gallery_cursor(request.args.get('cursor'))
+        if cursor:
+            query = query.where(db.tuple_(Poster.created_at, Poster.id) < cursor)
+        
+        # Fetch one extra row to learn whether another page exists
+        query = query.order_by(Poster.created_at.desc(), Poster.id.desc()).limit(GALLERY_PAGE_SIZE + 1)
+        posters = db.session.scalars(query).all()
+        
+        if len(posters) > GALLERY_PAGE_SIZE:
+            posters = posters[:GALLERY_PAGE_SIZE]
+            last = posters[-1]
+            next_cursor = f"{last.created_at.isoformat()}_{last.id}"
+    
+    return render_template('gallery.html', posters=posters, next_cursor=next_cursor)
+
+
+def _parse_gallery_cursor(cursor):
+    """
+    Parse a gallery cursor of the form ``{created_at ISO}_{poster id}``.
     
-    return render_template('gallery.html', posters=posters if session_id else [])
\ No newline at end of file
+    Returns:
+        (created_at, poster_id) tuple, or None if missing or malformed
+    """
+    if not cursor:
+        return None
+    created_at, _, poster_id = cursor.partition('_')
+    try:
+        return datetime.fromisoformat(created_at), poster_id
+    except ValueError:
+        return None
\ No newline at end of file
@@ -1,73 +1,98 @@
 """Celery worker entry point."""
 
+import atexit
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from pathlib import Path
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from celery.signals import worker_process_init, worker_process_shutdown
 from app import create_app
 
-
-class DebugFilter(logging.Filter):
-    """Filter to only allow DEBUG level logs."""
-    def filter(self, record):
-        return record.levelno == logging.DEBUG
-
-
-class InfoAndAboveFilter(logging.Filter):
-    """Filter to exclude DEBUG level logs (INFO and above only)."""
-    def filter(self, record):
-        return record.levelno >= logging.INFO
-
 # Setup Celery logging with split debug and info logs
-log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-os.makedirs(log_dir, exist_ok=True)
+LOG_DIR = Path(__file__).resolve().parent / 'logs'
+LOG_DIR.mkdir(exist_ok=True)
 
 # Configure log format
 log_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-# Main log handler (INFO and above) - logs/celery.log
+# Main log handler (INFO and above, enforced by the handler level) - logs/celery.log
 main_handler = RotatingFileHandler(
-    os.path.join(log_dir, 'celery.log'),
+    LOG_DIR / 'celery.log',
     maxBytes=10*1024*1024,  # 10MB
     backupCount=5
 )
 main_handler.setLevel(logging.INFO)
 main_handler.setFormatter(log_format)
-main_handler.addFilter(InfoAndAboveFilter())
 
-# Debug log handler (DEBUG only) - logs/celery_debug.log
-debug_handler = RotatingFileHandler(
-    os.path.join(log_dir, 'celery_debug.log'),
-    maxBytes=10*1024*1024,  # 10MB
-    backupCount=3
-)
-debug_handler.setLevel(logging.DEBUG)
-debug_handler.setFormatter(log_format)
-debug_handler.addFilter(DebugFilter())
+log_handlers = [main_handler]
+
+# Debug log handler (DEBUG only) - logs/celery_debug.log, opt-in with
+# CELERY_DEBUG_LOG=1 so production workers neither emit nor write DEBUG
+debug_logging = os.environ.get('CELERY_DEBUG_LOG') == '1'
+if debug_logging:
+    debug_handler = RotatingFileHandler(
+        LOG_DIR / 'celery_debug.log',
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=3
+    )
+    debug_handler.setLevel(logging.DEBUG)
+    debug_handler.setFormatter(log_format)
+    # setLevel lets everything from DEBUG up through; keep only DEBUG here
+    debug_handler.addFilter(lambda record: record.levelno == logging.DEBUG)
+    log_handlers.append(debug_handler)
+
+log_level = logging.DEBUG if debug_logging else logging.INFO
+
+# Loggers only enqueue records; a background listener thread does the
+# formatting and file I/O so task code never blocks on the log files
+queue_handler = QueueHandler(queue.SimpleQueue())
+
+
+def start_log_listener():
+    """Give the queue handler a fresh queue drained by a new listener thread."""
+    queue_handler.queue = queue.SimpleQueue()
+    listener = QueueListener(queue_handler.queue, *log_handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+@worker_process_init.connect
+def restart_log_listener(**kwargs):
+    """Prefork children inherit the queue but not the listener thread."""
+    global log_listener
+    log_listener = start_log_listener()
+
+
+@worker_process_shutdown.connect
+def stop_log_listener(**kwargs):
+    """
+    Drain queued records before a prefork child exits.
+    
+    Children leave through os._exit, which skips atexit handlers.
+    """
+    log_listener.stop()
+
+
+log_listener = start_log_listener()
+atexit.register(log_listener.stop)
 
 # Configure Celery logger
 celery_logger = logging.getLogger('celery')
-celery_logger.setLevel(logging.DEBUG)
+celery_logger.setLevel(log_level)
 
-# Clear existing handlers to prevent duplicates
-if celery_logger.handlers:
-    celery_logger.handlers.clear()
-
-celery_logger.addHandler(main_handler)
-celery_logger.addHandler(debug_handler)
+# Replace existing handlers to prevent duplicates
+celery_logger.handlers = [queue_handler]
 
 # Prevent propagation to avoid duplicate logs
 celery_logger.propagate = False
 
 # Configure root logger
 root_logger = logging.getLogger()
-root_logger.setLevel(logging.DEBUG)
-
-# Clear existing handlers to prevent duplicates
-if root_logger.handlers:
-    root_logger.handlers.clear()
+root_logger.setLevel(log_level)
 
-root_logger.addHandler(main_handler)
-root_logger.addHandler(debug_handler)
+# Replace existing handlers to prevent duplicates
+root_logger.handlers = [queue_handler]
 
 # Create Flask app
 app = create_app()
@@ -87,10 +112,11 @@ if __name__ == '__main__':
     print("Backend:", app.config['CELERY_RESULT_BACKEND'])
     print("=" * 60)
     
-    # Start worker
+    # Start worker; thumbnails are routed to their own queue, so consume
+    # it alongside the default one. Concurrency and child recycling come
+    # from the app config (CELERY_WORKER_* settings)
     celery.worker_main([
         'worker',
-        '--loglevel=info',
-        '--concurrency=2',
-        '--max-tasks-per-child=50'
+        '-Q', 'celery,thumbnails',
+        '--loglevel=info'
     ])
\ No newline at end of file
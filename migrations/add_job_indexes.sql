@@ -0,0 +1,8 @@
+-- Migration: Add composite batch/status index to jobs table
+-- Date: 2026-10-15
+-- Description: Speed up batch status polls and batch downloads, which filter
+-- jobs by batch_id and status together
+
+-- id is the primary key and batch_id, session_id and status already carry
+-- single-column indexes (ix_jobs_*), so only the composite index is new
+CREATE INDEX IF NOT EXISTS ix_jobs_batch_id_status ON jobs (batch_id, status);
@@ -0,0 +1,84 @@
+-- Migration: Add server-side defaults for jobs.status and jobs.created_at
+-- Date: 2026-10-15
+-- Description: Let the database fill in status and created_at for rows
+-- inserted outside the application. The application still sends both
+-- values, so existing databases keep working without this migration.
+
+-- ============================================================================
+-- PostgreSQL
+-- ============================================================================
+-- ALTER TABLE jobs ALTER COLUMN status SET DEFAULT 'PENDING';
+-- ALTER TABLE jobs ALTER COLUMN created_at SET DEFAULT now();
+
+-- ============================================================================
+-- SQLite
+-- ============================================================================
+-- SQLite cannot change a column default in place, so the jobs table is
+-- rebuilt. Run add_progress_steps.sql and add_page_format_dpi.sql first.
+
+PRAGMA foreign_keys = OFF;
+
+BEGIN TRANSACTION;
+
+CREATE TABLE jobs_new (
+    id VARCHAR(36) NOT NULL,
+    city VARCHAR(100) NOT NULL,
+    country VARCHAR(100) NOT NULL,
+    theme VARCHAR(50) NOT NULL,
+    distance INTEGER NOT NULL,
+    latitude FLOAT NOT NULL,
+    longitude FLOAT NOT NULL,
+    preview_mode BOOLEAN,
+    page_format VARCHAR(20) NOT NULL DEFAULT 'classic',
+    orientation VARCHAR(10) NOT NULL DEFAULT 'portrait',
+    dpi INTEGER NOT NULL DEFAULT 300,
+    custom_width_inches FLOAT,
+    custom_height_inches FLOAT,
+    status VARCHAR(10) NOT NULL DEFAULT 'PENDING',
+    progress INTEGER,
+    current_step VARCHAR(200),
+    progress_steps JSON,
+    session_id VARCHAR(100),
+    user_id INTEGER,
+    batch_id VARCHAR(36),
+    created_at DATETIME NOT NULL DEFAULT (CURRENT_TIMESTAMP),
+    started_at DATETIME,
+    completed_at DATETIME,
+    failed_at DATETIME,
+    estimated_completion DATETIME,
+    error_type VARCHAR(100),
+    error_message TEXT,
+    error_traceback TEXT,
+    result JSON,
+    PRIMARY KEY (id)
+);
+
+INSERT INTO jobs_new (
+    id, city, country, theme, distance, latitude, longitude, preview_mode,
+    page_format, orientation, dpi, custom_width_inches, custom_height_inches,
+    status, progress, current_step, progress_steps, session_id, user_id,
+    batch_id, created_at, started_at, completed_at, failed_at,
+    estimated_completion, error_type, error_message, error_traceback, result
+)
+SELECT
+    id, city, country, theme, distance, latitude, longitude, preview_mode,
+    COALESCE(page_format, 'classic'), COALESCE(orientation, 'portrait'),
+    COALESCE(dpi, 300), custom_width_inches, custom_height_inches,
+    status, progress, current_step, progress_steps, session_id, user_id,
+    batch_id, created_at, started_at, completed_at, failed_at,
+    estimated_completion, error_type, error_message, error_traceback, result
+FROM jobs;
+
+DROP TABLE jobs;
+ALTER TABLE jobs_new RENAME TO jobs;
+
+CREATE INDEX ix_jobs_status ON jobs (status);
+CREATE INDEX ix_jobs_session_id ON jobs (session_id);
+CREATE INDEX ix_jobs_user_id ON jobs (user_id);
+CREATE INDEX ix_jobs_batch_id ON jobs (batch_id);
+CREATE INDEX ix_jobs_created_at ON jobs (created_at);
+CREATE INDEX ix_jobs_batch_id_status ON jobs (batch_id, status);
+
+COMMIT;
+
+PRAGMA foreign_keys = ON;
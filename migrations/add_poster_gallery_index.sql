@@ -0,0 +1,6 @@
+-- Migration: Add composite session/created_at index to posters table
+-- Date: 2026-10-15
+-- Description: Serve gallery pages, which list a session's posters newest
+-- first with keyset pagination, from a single index range scan
+
+CREATE INDEX IF NOT EXISTS ix_posters_session_id_created_at ON posters (session_id, created_at);
@@ -0,0 +1,20 @@
+-- Migration: Store job identifiers as native UUID on PostgreSQL
+-- Date: 2026-10-15
+-- Description: Convert jobs.id, jobs.batch_id and posters.job_id from
+-- VARCHAR(36) to the 16-byte uuid type for smaller indexes and faster lookups
+
+-- PostgreSQL only. SQLite keeps VARCHAR(36) columns, so there is nothing to
+-- do there. The foreign key must be dropped while both sides change type.
+
+BEGIN;
+
+ALTER TABLE posters DROP CONSTRAINT IF EXISTS posters_job_id_fkey;
+
+ALTER TABLE jobs ALTER COLUMN id TYPE uuid USING id::uuid;
+ALTER TABLE jobs ALTER COLUMN batch_id TYPE uuid USING batch_id::uuid;
+ALTER TABLE posters ALTER COLUMN job_id TYPE uuid USING job_id::uuid;
+
+ALTER TABLE posters
+    ADD CONSTRAINT posters_job_id_fkey FOREIGN KEY (job_id) REFERENCES jobs (id);
+
+COMMIT;
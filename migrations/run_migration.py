@@ -16,6 +16,7 @@ Or specify a custom database path:
     python migrations/run_migration.py --db-path /path/to/database.db
 """
 
+import re
 import sqlite3
 import sys
 import logging
@@ -34,6 +35,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Project root (parent of the migrations directory) and the migration script
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MIGRATION_FILE = PROJECT_ROOT / 'migrations' / 'add_page_format_dpi.sql'
+
+# Candidate database locations, checked in order
+DATABASE_LOCATIONS = (
+    PROJECT_ROOT / 'posters.db',
+    PROJECT_ROOT / 'instance' / 'posters.db',
+)
+
+# Whole-line SQL comments, stripped from the file before splitting
+COMMENT_LINE = re.compile(r'^[ \t]*--.*(?:\n|$)', re.MULTILINE)
+
+# Statement classification for progress logging; one match per statement
+STATEMENT_KIND = re.compile(
+    r'\s*(?:ALTER\s+TABLE\s+(?P<table>\w+)\s+ADD\s+COLUMN\s+(?P<column>\w+)|(?P<update>UPDATE)\b)',
+    re.IGNORECASE
+)
+
 
 def find_database():
     """
@@ -49,22 +69,13 @@ def find_database():
     Raises:
         FileNotFoundError: If no database file is found
     """
-    # Get project root (parent of migrations directory)
-    project_root = Path(__file__).parent.parent
-    
-    # Check possible locations
-    possible_locations = [
-        project_root / 'posters.db',
-        project_root / 'instance' / 'posters.db'
-    ]
-    
-    for db_path in possible_locations:
+    for db_path in DATABASE_LOCATIONS:
         if db_path.exists():
             logger.info(f"Found database at: {db_path}")
             return db_path
     
     # No database found
-    locations_str = '\n  - '.join(str(p) for p in possible_locations)
+    locations_str = '\n  - '.join(str(p) for p in DATABASE_LOCATIONS)
     raise FileNotFoundError(
         f"Database not found. Checked:\n  - {locations_str}\n"
         "Please ensure the database exists before running migrations."
@@ -103,55 +114,71 @@ def column_exists(cursor, table_name, column_name):
     return column_name in columns
 
 
-def check_migration_needed(cursor):
+# Columns the migration adds, per table
+EXPECTED_COLUMNS = {
+    'jobs': [
+        'page_format',
+        'orientation',
+        'dpi',
+        'custom_width_inches',
+        'custom_height_inches'
+    ],
+    'posters': [
+        'page_format',
+        'orientation',
+        'dpi',
+        'custom_width_inches',
+        'custom_height_inches',
+        'width_inches',
+        'height_inches'
+    ]
+}
+
+
+def get_existing_columns(cursor):
     """
-    Check which columns need to be added.
+    Read the current columns of every migrated table in one pass.
     
     Args:
         cursor: SQLite cursor
         
+    Returns:
+        dict: Table name to set of column names, for tables that exist
+    """
+    # One round trip: join the table list against the pragma_table_info
+    # table-valued function instead of a PRAGMA table_info per table
+    cursor.execute(
+        "SELECT m.name, p.name FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p "
+        f"WHERE m.type = 'table' AND m.name IN ({','.join('?' * len(EXPECTED_COLUMNS))})",
+        tuple(EXPECTED_COLUMNS)
+    )
+    existing = {}
+    for table_name, column_name in cursor.fetchall():
+        existing.setdefault(table_name, set()).add(column_name)
+    
+    for table_name in EXPECTED_COLUMNS:
+        if table_name not in existing:
+            logger.warning(f"Table '{table_name}' does not exist!")
+    return existing
+
+
+def check_migration_needed(existing_columns):
+    """
+    Check which columns need to be added.
+    
+    Args:
+        existing_columns: Result of get_existing_columns
+        
     Returns:
         dict: Dictionary with tables as keys and lists of missing columns as values
     """
     logger.info("Checking which columns need to be added...")
     
-    # Define expected columns for each table
-    expected_columns = {
-        'jobs': [
-            'page_format',
-            'orientation',
-            'dpi',
-            'custom_width_inches',
-            'custom_height_inches'
-        ],
-        'posters': [
-            'page_format',
-            'orientation',
-            'dpi',
-            'custom_width_inches',
-            'custom_height_inches',
-            'width_inches',
-            'height_inches'
-        ]
-    }
-    
     missing_columns = {}
     
-    for table_name, columns in expected_columns.items():
-        # Check if table exists
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
-        )
-        if not cursor.fetchone():
-            logger.warning(f"Table '{table_name}' does not exist!")
-            continue
-        
-        # Get existing columns
-        existing_columns = get_table_columns(cursor, table_name)
-        
+    for table_name, existing in existing_columns.items():
         # Find missing columns
-        missing = [col for col in columns if col not in existing_columns]
+        missing = [col for col in EXPECTED_COLUMNS[table_name] if col not in existing]
         
         if missing:
             missing_columns[table_name] = missing
@@ -162,6 +189,29 @@ def check_migration_needed(cursor):
     return missing_columns
 
 
+def split_statements(sql):
+    """
+    Split migration SQL into individual statements without comments.
+    
+    Splits on every semicolon; the migration files keep none inside
+    string literals.
+    
+    Args:
+        sql: Migration file contents
+        
+    Returns:
+        list: Non-empty SQL statements
+    """
+    sql = COMMENT_LINE.sub('', sql)
+    
+    statements = []
+    for stmt in sql.split(';'):
+        stmt = stmt.strip().rstrip(';').strip()
+        if stmt:
+            statements.append(stmt)
+    return statements
+
+
 def execute_migration_statement(cursor, statement):
     """
     Execute a single migration statement with error handling.
@@ -202,7 +252,7 @@ def run_migration(db_path):
     logger.info("=" * 70)
     
     # Read migration SQL file
-    migration_file = Path(__file__).parent / 'add_page_format_dpi.sql'
+    migration_file = MIGRATION_FILE
     
     if not migration_file.exists():
         logger.error(f"Migration file not found: {migration_file}")
@@ -214,8 +264,14 @@ def run_migration(db_path):
     
     # Connect to database
     try:
-        conn = sqlite3.connect(db_path)
+        # Autocommit mode so the transaction below is managed explicitly;
+        # the sqlite3 module would otherwise commit each ALTER TABLE on its own
+        conn = sqlite3.connect(db_path, isolation_level=None)
         cursor = conn.cursor()
+        # Connection-local tuning: a 64 MiB page cache and in-memory temp
+        # storage for the table rewrites ALTER TABLE may trigger
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA temp_store=MEMORY")
         logger.info("Database connection established ✓")
     except sqlite3.Error as e:
         logger.error(f"Failed to connect to database: {e}")
@@ -223,7 +279,8 @@ def run_migration(db_path):
     
     try:
         # Check what needs to be migrated
-        missing_columns = check_migration_needed(cursor)
+        existing_columns = get_existing_columns(cursor)
+        missing_columns = check_migration_needed(existing_columns)
         
         if not missing_columns:
             logger.info("\n" + "=" * 70)
@@ -236,20 +293,7 @@ def run_migration(db_path):
         logger.info("=" * 70)
         
         # Split SQL into individual statements and clean them
-        raw_statements = migration_sql.split(';')
-        statements = []
-        
-        for stmt in raw_statements:
-            # Remove comments and empty lines
-            lines = []
-            for line in stmt.split('\n'):
-                stripped = line.strip()
-                if stripped and not stripped.startswith('--'):
-                    lines.append(line)
-            
-            cleaned_stmt = '\n'.join(lines).strip()
-            if cleaned_stmt:
-                statements.append(cleaned_stmt)
+        statements = split_statements(migration_sql)
         
         executed_count = 0
         skipped_count = 0
@@ -257,22 +301,26 @@ def run_migration(db_path):
         
         logger.info(f"Found {len(statements)} SQL statements to execute")
         
+        # Apply every statement in one write transaction: a single lock
+        # acquisition and journal sync, and a failure rolls back the DDL too.
+        # synchronous only lasts for this connection
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("BEGIN IMMEDIATE")
+        
         for i, statement in enumerate(statements, 1):
             
             # Log the statement type
-            statement_lower = statement.lower()
-            if 'alter table' in statement_lower:
-                # Extract table and column info
-                parts = statement.split()
-                if 'add column' in statement_lower:
-                    table_idx = parts.index('table') if 'table' in parts else -1
-                    if table_idx > 0 and table_idx + 1 < len(parts):
-                        table_name = parts[table_idx + 1]
-                        column_idx = parts.index('column') if 'column' in parts else -1
-                        if column_idx > 0 and column_idx + 1 < len(parts):
-                            column_name = parts[column_idx + 1]
-                            logger.info(f"  [{i}/{len(statements)}] Adding column '{column_name}' to '{table_name}'...")
-            elif 'update' in statement_lower:
+            kind = STATEMENT_KIND.match(statement)
+            if kind and kind.group('column'):
+                table_name, column_name = kind.group('table'), kind.group('column')
+                logger.info(f"  [{i}/{len(statements)}] Adding column '{column_name}' to '{table_name}'...")
+                
+                # Already-applied columns are skipped without touching the database
+                if column_name in existing_columns.get(table_name, ()):
+                    logger.info("    → Column already exists (skipped)")
+                    skipped_count += 1
+                    continue
+            elif kind and kind.group('update'):
                 logger.info(f"  [{i}/{len(statements)}] Updating default values...")
             
             # Execute statement
@@ -291,7 +339,7 @@ def run_migration(db_path):
         
         # Commit changes
         if failed_count == 0:
-            conn.commit()
+            cursor.execute("COMMIT")
             logger.info("\n" + "=" * 70)
             logger.info("Migration completed successfully! ✓")
             logger.info(f"  Executed: {executed_count} statements")
@@ -299,7 +347,7 @@ def run_migration(db_path):
             logger.info("=" * 70)
             return True
         else:
-            conn.rollback()
+            cursor.execute("ROLLBACK")
             logger.error("\n" + "=" * 70)
             logger.error(f"Migration failed! {failed_count} statements had errors")
             logger.error("Changes have been rolled back.")
@@ -307,7 +355,8 @@ def run_migration(db_path):
             return False
         
     except Exception as e:
-        conn.rollback()
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
         logger.error(f"\nUnexpected error during migration: {e}")
         logger.exception("Full traceback:")
         return False
@@ -15,7 +15,7 @@ if __name__ == '__main__':
     # Get configuration from environment
     host = os.environ.get('FLASK_HOST', '0.0.0.0')
     port = int(os.environ.get('FLASK_PORT', 5000))
-    debug = os.environ.get('FLASK_ENV', 'development') == 'development'
+    debug = env == 'development'
     
     print("=" * 60)
     print("City Map Poster Generator - Web Application")
@@ -8,19 +8,41 @@ a well-known city (Paris) with a small distance for fast generation.
 
 import os
 import sys
+import argparse
+import io
 import json
+import multiprocessing
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add parent directory to path to import from root
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Headless backend before anything can pull in pyplot; previews are only
+# ever written to files
+import matplotlib
+matplotlib.use('Agg')
+
+import geopandas as gpd
 import osmnx as ox
+from shapely.geometry import box
+from shapely.geometry.polygon import orient
 import matplotlib.pyplot as plt
+plt.ioff()
 from matplotlib.font_manager import FontProperties
 import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path as MplPath
 import numpy as np
 from geopy.geocoders import Nominatim
-import time
+
+try:
+    import pymtpng
+except ImportError:  # pymtpng is optional
+    pymtpng = None
 
 # Configuration
 THEMES_DIR = Path("themes")
@@ -32,6 +54,25 @@ PREVIEW_COORDS = (48.8566, 2.3522)  # Paris coordinates
 PREVIEW_DISTANCE = 3000  # 3km for fast generation
 PREVIEW_SIZE = (4, 6)  # Small size for previews
 PREVIEW_DPI = 75  # Lower DPI for web display
+SPACED_CITY = "  ".join(PREVIEW_CITY.upper())  # Title as printed on every preview
+PREVIEW_WORKERS = os.cpu_count() or 1  # Themes rendered in parallel
+PREVIEW_PNG_COMPRESS_LEVEL = 1  # Fast DEFLATE; previews are small either way
+
+# Downloaded map data is kept here between runs
+CACHE_DIR = Path(".cache/preview_map")
+
+# Forked workers inherit the downloaded map data without pickling; other
+# start methods read it from a pickle written once for the whole pool
+MP_CONTEXT = multiprocessing.get_context(
+    'fork' if 'fork' in multiprocessing.get_all_start_methods() else None
+)
+
+# Rasterized map layers and fonts for the current run, set once per worker by _init_worker
+_worker_data = None
+
+# One figure per process, cleared and redrawn for every theme so the
+# canvas and Agg renderer are built once
+_figure = None
 
 def load_fonts():
     """Load Roboto fonts from the fonts directory."""
@@ -49,32 +90,78 @@ def load_fonts():
     
     return {k: str(v) for k, v in fonts.items()}
 
+def build_font_properties(fonts):
+    """Title and subtitle FontProperties, built once and shared by every theme."""
+    if fonts:
+        return {
+            'main': FontProperties(fname=fonts['bold'], size=24),
+            'sub': FontProperties(fname=fonts['light'], size=10),
+        }
+    return {
+        'main': FontProperties(family='monospace', weight='bold', size=24),
+        'sub': FontProperties(family='monospace', size=10),
+    }
+
 def load_theme(theme_path):
-    """Load theme from JSON file."""
+    """Load theme from JSON file, adding its upper-cased 'display_name'."""
     try:
         with open(theme_path, 'r') as f:
-            return json.load(f)
+            theme = json.load(f)
+        theme['display_name'] = theme.get('name', Path(theme_path).stem).upper()
+        return theme
     except Exception as e:
         print(f"✗ Error loading theme {theme_path}: {e}")
         return None
 
+def fetch_features(tags):
+    """Download area features around the preview point, or None if there are none."""
+    try:
+        return ox.features_from_point(PREVIEW_COORDS, tags=tags, dist=PREVIEW_DISTANCE)
+    except Exception:
+        return None
+
+def map_data_cache_path():
+    """Cache file for the preview area's streets, water and parks."""
+    lat, lon = PREVIEW_COORDS
+    return CACHE_DIR / f"map_{lat:.4f}_{lon:.4f}_{PREVIEW_DISTANCE}.pkl"
+
+def load_cached_map_data():
+    """Load (G, water, parks) saved by a previous run, or None."""
+    path = map_data_cache_path()
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠ Ignoring unreadable map data cache {path}: {e}")
+        return None
+
+def save_cached_map_data(map_data):
+    """Save (G, water, parks) for the next run."""
+    path = map_data_cache_path()
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(map_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        print(f"⚠ Could not write map data cache {path}: {e}")
+
 def create_gradient_fade(ax, color, location='bottom', zorder=10):
     """Create a fade effect at the top or bottom of the map."""
-    vals = np.linspace(0, 1, 256).reshape(-1, 1)
-    gradient = np.hstack((vals, vals))
+    # A single column is enough; imshow stretches it across the extent
+    ramp = np.linspace(0, 1, 256)
+    gradient = ramp.reshape(-1, 1)
     
-    rgb = mcolors.to_rgb(color)
-    my_colors = np.zeros((256, 4))
-    my_colors[:, 0] = rgb[0]
-    my_colors[:, 1] = rgb[1]
-    my_colors[:, 2] = rgb[2]
+    my_colors = np.empty((256, 4))
+    my_colors[:, :3] = mcolors.to_rgb(color)
     
     if location == 'bottom':
-        my_colors[:, 3] = np.linspace(1, 0, 256)
+        my_colors[:, 3] = ramp[::-1]
         extent_y_start = 0
         extent_y_end = 0.25
     else:
-        my_colors[:, 3] = np.linspace(0, 1, 256)
+        my_colors[:, 3] = ramp
         extent_y_start = 0.75
         extent_y_end = 1.0
 
@@ -90,116 +177,278 @@ def create_gradient_fade(ax, color, location='bottom', zorder=10):
     ax.imshow(gradient, extent=[xlim[0], xlim[1], y_bottom, y_top], 
               aspect='auto', cmap=custom_cmap, zorder=zorder, origin='lower')
 
-def get_edge_colors_by_type(G, theme):
-    """Assign colors to edges based on road type hierarchy."""
-    edge_colors = []
+# Road hierarchy: highway type -> category index into the per-category
+# theme color keys and line widths below; anything else is 'road_default'
+ROAD_CATEGORIES = {
+    'motorway': 0, 'motorway_link': 0,
+    'trunk': 1, 'trunk_link': 1, 'primary': 1, 'primary_link': 1,
+    'secondary': 2, 'secondary_link': 2,
+    'tertiary': 3, 'tertiary_link': 3,
+    'residential': 4, 'living_street': 4, 'unclassified': 4,
+}
+DEFAULT_ROAD_CATEGORY = 5
+ROAD_COLOR_KEYS = ('road_motorway', 'road_primary', 'road_secondary',
+                   'road_tertiary', 'road_residential', 'road_default')
+ROAD_WIDTHS = np.array([0.6, 0.5, 0.4, 0.3, 0.2, 0.2])
+
+def classify_edges(G):
+    """Road category of every edge of G, in edge order (computed once per run)."""
+    categories = np.empty(G.number_of_edges(), dtype=np.int8)
     
-    for u, v, data in G.edges(data=True):
-        highway = data.get('highway', 'unclassified')
-        
-        if isinstance(highway, list):
+    for i, (u, v, highway) in enumerate(G.edges(data='highway', default='unclassified')):
+        if type(highway) is list:
             highway = highway[0] if highway else 'unclassified'
         
-        if highway in ['motorway', 'motorway_link']:
-            color = theme['road_motorway']
-        elif highway in ['trunk', 'trunk_link', 'primary', 'primary_link']:
-            color = theme['road_primary']
-        elif highway in ['secondary', 'secondary_link']:
-            color = theme['road_secondary']
-        elif highway in ['tertiary', 'tertiary_link']:
-            color = theme['road_tertiary']
-        elif highway in ['residential', 'living_street', 'unclassified']:
-            color = theme['road_residential']
-        else:
-            color = theme['road_default']
-        
-        edge_colors.append(color)
+        categories[i] = ROAD_CATEGORIES.get(highway, DEFAULT_ROAD_CATEGORY)
     
-    return edge_colors
+    return categories
+
+def build_edge_segments(G):
+    """
+    Edge line segments of G, in edge order, and the graph's padded bounds.
+    
+    Built once per run so themes draw roads from ready-made vertex arrays
+    instead of having ox.plot_graph rebuild the edge geometries each time.
+    """
+    edges = ox.graph_to_gdfs(G, nodes=False, fill_edge_geometry=True)
+    segments = [np.asarray(geom.coords) for geom in edges.geometry]
+    
+    # Same 2% padding around the network as ox.plot_graph
+    min_x, min_y, max_x, max_y = edges.total_bounds
+    pad_x = (max_x - min_x) * 0.02
+    pad_y = (max_y - min_y) * 0.02
+    bounds = ((min_x - pad_x, max_x + pad_x), (min_y - pad_y, max_y + pad_y))
+    return segments, bounds
+
+def prepare_area_features(features, crs, bounds):
+    """
+    Project, clip and simplify water or park polygons once per run.
+    
+    Everything outside the plotted bounds is dropped and outlines are
+    simplified to about one output pixel, so each theme's plot call
+    tessellates only the vertices that can show up in the preview.
+    """
+    if features is None or features.empty:
+        return features
+    
+    (min_x, max_x), (min_y, max_y) = bounds
+    features = gpd.clip(features.to_crs(crs), box(min_x, min_y, max_x, max_y))
+    tolerance = (max_x - min_x) / (PREVIEW_SIZE[0] * PREVIEW_DPI)
+    features['geometry'] = features.simplify(tolerance, preserve_topology=True)
+    return features
 
-def get_edge_widths_by_type(G):
-    """Assign line widths to edges based on road type."""
-    edge_widths = []
+def area_patch(features, **kwargs):
+    """
+    One PathPatch covering every polygon in a GeoDataFrame.
+    
+    Builds the compound path straight from the shapely rings instead of
+    going through GeoDataFrame.plot, which creates a patch per geometry
+    and re-derives the axes aspect from the CRS. Exteriors and holes are
+    oriented opposite ways so holes stay empty under matplotlib's nonzero
+    fill rule. Point and line features are skipped.
+    """
+    paths = []
+    for geom in features.geometry:
+        for polygon in getattr(geom, 'geoms', (geom,)):
+            if polygon.geom_type != 'Polygon' or polygon.is_empty:
+                continue
+            polygon = orient(polygon, 1.0)
+            for ring in (polygon.exterior, *polygon.interiors):
+                paths.append(MplPath(np.asarray(ring.coords)[:, :2], closed=True))
+    return PathPatch(MplPath.make_compound_path(*paths), **kwargs) if paths else None
+
+def render_map_layers(edge_segments, edge_categories, water, parks):
+    """
+    Rasterize the water, park and road layers once as coverage masks.
+    
+    The geometry is the same for every theme and only the colors change,
+    so each layer is drawn on its own in white on black and its
+    antialiased coverage is kept. A theme then only composites its colors
+    over its background instead of redrawing every polygon and road.
+    
+    Returns:
+        (layers, frame): layers is a list of (theme color key, coverage)
+        in drawing order, coverage being a float32 array of preview pixels
+        in [0, 1]; frame is the map axes' (position, xlim, ylim)
+    """
+    segments, (xlim, ylim) = edge_segments
+    fig = plt.figure(figsize=PREVIEW_SIZE, dpi=PREVIEW_DPI, facecolor='black')
+    ax = fig.add_axes([0, 0, 1, 1])
+    
+    def frame_map():
+        # Frame the network like ox.plot_graph: projected data, equal aspect
+        ax.set_xlim(xlim)
+        ax.set_ylim(ylim)
+        ax.set_aspect('equal')
+        ax.axis('off')
+    
+    def capture():
+        frame_map()
+        fig.canvas.draw()
+        coverage = np.asarray(fig.canvas.buffer_rgba())[:, :, 0].astype(np.float32) / 255
+        for artist in (*ax.collections, *ax.patches):
+            artist.remove()
+        return coverage
+    
+    layers = []
+    for color_key, features in (('water', water), ('parks', parks)):
+        patch = area_patch(features, facecolor='white', edgecolor='none') if features is not None else None
+        if patch is not None:
+            ax.add_patch(patch)
+            layers.append((color_key, capture()))
+    
+    # Minor roads first so major roads end up on top
+    for category in reversed(range(len(ROAD_COLOR_KEYS))):
+        indices = np.flatnonzero(edge_categories == category)
+        if not len(indices):
+            continue
+        ax.add_collection(LineCollection([segments[i] for i in indices], colors='white',
+                                         linewidths=ROAD_WIDTHS[category]))
+        layers.append((ROAD_COLOR_KEYS[category], capture()))
     
-    for u, v, data in G.edges(data=True):
-        highway = data.get('highway', 'unclassified')
-        
-        if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
-        
-        if highway in ['motorway', 'motorway_link']:
-            width = 0.6
-        elif highway in ['trunk', 'trunk_link', 'primary', 'primary_link']:
-            width = 0.5
-        elif highway in ['secondary', 'secondary_link']:
-            width = 0.4
-        elif highway in ['tertiary', 'tertiary_link']:
-            width = 0.3
-        else:
-            width = 0.2
-        
-        edge_widths.append(width)
+    # Where the equal-aspect map axes ended up inside the figure
+    frame_map()
+    ax.apply_aspect()
+    frame = (ax.get_position().bounds, xlim, ylim)
     
-    return edge_widths
+    plt.close(fig)
+    return layers, frame
 
-def generate_preview(theme_name, theme, G, water, parks, fonts, output_path):
+def composite_map(map_layers, theme):
+    """Paint a theme's colors through the layer coverage masks, over its background."""
+    layers, _ = map_layers
+    height, width = layers[0][1].shape if layers else (
+        int(PREVIEW_SIZE[1] * PREVIEW_DPI), int(PREVIEW_SIZE[0] * PREVIEW_DPI)
+    )
+    
+    image = np.empty((height, width, 3), dtype=np.float32)
+    image[:] = mcolors.to_rgb(theme['bg'])
+    for color_key, coverage in layers:
+        color = np.asarray(mcolors.to_rgb(theme[color_key]), dtype=np.float32)
+        image += (color - image) * coverage[:, :, None]
+    return image
+
+def generate_preview(theme_name, theme, map_layers, font_props, output_path):
     """Generate a single preview poster for a theme."""
     print(f"  Rendering {theme_name}...")
     
-    # Setup plot
-    fig, ax = plt.subplots(figsize=PREVIEW_SIZE, facecolor=theme['bg'])
-    ax.set_facecolor(theme['bg'])
-    ax.set_position([0, 0, 1, 1])
-    
-    # Plot layers
-    if water is not None and not water.empty:
-        water.plot(ax=ax, facecolor=theme['water'], edgecolor='none', zorder=1)
-    if parks is not None and not parks.empty:
-        parks.plot(ax=ax, facecolor=theme['parks'], edgecolor='none', zorder=2)
-    
-    # Roads with hierarchy coloring
-    edge_colors = get_edge_colors_by_type(G, theme)
-    edge_widths = get_edge_widths_by_type(G)
-    
-    ox.plot_graph(
-        G, ax=ax, bgcolor=theme['bg'],
-        node_size=0,
-        edge_color=edge_colors,
-        edge_linewidth=edge_widths,
-        show=False, close=False
-    )
+    # Setup plot on the reused figure
+    global _figure
+    if _figure is None:
+        _figure = plt.figure(figsize=PREVIEW_SIZE, dpi=PREVIEW_DPI)
+    fig = _figure
+    fig.clf()
+    # The background is set once, on the figure patch; savefig uses it
+    fig.patch.set_facecolor(theme['bg'])
+    
+    # Map layers, placed pixel for pixel (figure and mask DPI match)
+    fig.figimage(composite_map(map_layers, theme), origin='upper')
+    
+    # Gradients and text go on an invisible axes over the map area, with
+    # the same limits the map was drawn with
+    position, xlim, ylim = map_layers[1]
+    ax = fig.add_axes(position, zorder=1)  # Figure images draw after zorder-0 axes
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    ax.axis('off')
     
     # Gradients
     create_gradient_fade(ax, theme['gradient_color'], location='bottom', zorder=10)
     create_gradient_fade(ax, theme['gradient_color'], location='top', zorder=10)
     
     # Typography (smaller for preview)
-    if fonts:
-        font_main = FontProperties(fname=fonts['bold'], size=24)
-        font_sub = FontProperties(fname=fonts['light'], size=10)
-    else:
-        font_main = FontProperties(family='monospace', weight='bold', size=24)
-        font_sub = FontProperties(family='monospace', size=10)
-    
-    spaced_city = "  ".join(list(PREVIEW_CITY.upper()))
+    font_main = font_props['main']
+    font_sub = font_props['sub']
     
-    ax.text(0.5, 0.12, spaced_city, transform=ax.transAxes,
+    ax.text(0.5, 0.12, SPACED_CITY, transform=ax.transAxes,
             color=theme['text'], ha='center', fontproperties=font_main, zorder=11)
     
-    ax.text(0.5, 0.08, theme.get('name', theme_name).upper(), transform=ax.transAxes,
+    ax.text(0.5, 0.08, theme['display_name'], transform=ax.transAxes,
             color=theme['text'], ha='center', fontproperties=font_sub, zorder=11)
     
     ax.plot([0.4, 0.6], [0.10, 0.10], transform=ax.transAxes, 
             color=theme['text'], linewidth=0.5, zorder=11)
     
     # Save
-    plt.savefig(output_path, dpi=PREVIEW_DPI, facecolor=theme['bg'], bbox_inches='tight', pad_inches=0.1)
-    plt.close()
+    if save_preview(fig, output_path):
+        print(f"    ✓ Saved: {output_path}")
+    else:
+        print(f"    ✓ Unchanged: {output_path}")
+
+def save_preview(fig, output_path):
+    """
+    Write the preview PNG.
+    
+    The map fills the figure, so the whole canvas is written as-is
+    (PREVIEW_SIZE * PREVIEW_DPI pixels) without a tight-bbox pass. With
+    pymtpng installed the RGBA buffer is encoded with its multi-threaded
+    encoder; otherwise Pillow encodes it at a low compression level.
+    
+    The PNG is encoded in memory and written with one call to a temporary
+    file that is renamed over the preview, so an interrupted run never
+    leaves a truncated image. An identical existing preview is not
+    rewritten, only its mtime is refreshed.
+    
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    buffer = io.BytesIO()
+    if pymtpng is None:
+        fig.savefig(buffer, format='png', dpi=PREVIEW_DPI,
+                    pil_kwargs={'compress_level': PREVIEW_PNG_COMPRESS_LEVEL, 'optimize': False})
+    else:
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        pymtpng.encode_png(rgba, buffer, compression_level=pymtpng.CompressionLevel.Fast,
+                           filter=pymtpng.Filter.Adaptive)
+    data = buffer.getbuffer()
     
-    print(f"    ✓ Saved: {output_path}")
+    output_path = Path(output_path)
+    try:
+        if output_path.read_bytes() == data:
+            # Mark it current for the up-to-date check on the next run
+            os.utime(output_path)
+            return False
+    except FileNotFoundError:
+        pass
+    
+    tmp_path = output_path.with_suffix('.png.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, output_path)
+    return True
+
+def preview_path(theme_name):
+    """Output path of a theme's preview image."""
+    return OUTPUT_DIR / f"{theme_name}_preview.png"
+
+def is_preview_current(theme_file, script_mtime):
+    """True if the theme's preview is newer than the theme file and the script."""
+    try:
+        preview_mtime = preview_path(theme_file.stem).stat().st_mtime
+    except FileNotFoundError:
+        return False
+    return preview_mtime > max(theme_file.stat().st_mtime, script_mtime)
+
+def _init_worker(data, data_path=None):
+    """Process pool initializer: keep the map data and fonts."""
+    global _worker_data
+    if data is None:
+        with open(data_path, 'rb') as f:
+            data = pickle.load(f)
+    _worker_data = data
+
+def _render_in_worker(theme_name, theme, output_path):
+    """Render one theme preview in a pool process."""
+    map_layers, font_props = _worker_data
+    generate_preview(theme_name, theme, map_layers, font_props, output_path)
 
 def main():
     """Generate preview images for all themes."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate every preview, even ones newer than their theme')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Theme Preview Generator")
     print("=" * 60)
@@ -231,78 +480,128 @@ def main():
     print(f"Found {len(theme_files)} themes")
     print()
     
+    success_count = 0
+    error_count = 0
+    skipped_count = 0
+    
+    # Load themes up front; broken files are counted as errors. A preview
+    # newer than both its theme file and this script is already current
+    script_mtime = Path(__file__).stat().st_mtime
+    themes = {}
+    for theme_file in theme_files:
+        if not args.force and is_preview_current(theme_file, script_mtime):
+            skipped_count += 1
+            continue
+        theme = load_theme(theme_file)
+        if theme:
+            themes[theme_file.stem] = theme
+        else:
+            error_count += 1
+    
+    if skipped_count:
+        print(f"Skipping {skipped_count} up-to-date previews (use --force to regenerate)")
+        print()
+    if not themes:
+        print("Nothing to generate")
+        return 0 if error_count == 0 else 1
+    
     # Fetch map data once (reuse for all themes)
     print(f"Fetching map data for {PREVIEW_CITY}...")
     print(f"  Location: {PREVIEW_COORDS}")
     print(f"  Distance: {PREVIEW_DISTANCE}m")
     
-    try:
-        # Fetch street network
-        print("  Downloading streets...")
-        G = ox.graph_from_point(PREVIEW_COORDS, dist=PREVIEW_DISTANCE, 
-                                dist_type='bbox', network_type='all')
-        time.sleep(0.5)
-        
-        # Fetch water features
-        print("  Downloading water features...")
-        try:
-            water = ox.features_from_point(PREVIEW_COORDS, 
-                                          tags={'natural': 'water', 'waterway': 'riverbank'}, 
-                                          dist=PREVIEW_DISTANCE)
-        except:
-            water = None
-        time.sleep(0.3)
-        
-        # Fetch parks
-        print("  Downloading parks...")
+    # Ask Overpass only when there is no local copy of this area yet;
+    # osmnx's own response cache covers partially completed runs
+    ox.settings.use_cache = True
+    ox.settings.cache_folder = str(CACHE_DIR / 'osmnx')
+    
+    cached = load_cached_map_data()
+    if cached is not None:
+        G, water, parks = cached
+        print(f"  ✓ Map data loaded from cache: {map_data_cache_path()}")
+    else:
         try:
-            parks = ox.features_from_point(PREVIEW_COORDS, 
-                                          tags={'leisure': 'park', 'landuse': 'grass'}, 
-                                          dist=PREVIEW_DISTANCE)
-        except:
-            parks = None
-        
-        print("  ✓ Map data downloaded")
-        print()
+            # Streets, water and parks are independent Overpass queries;
+            # download them concurrently so the wait is the slowest one
+            print("  Downloading streets, water features and parks...")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                future_streets = executor.submit(
+                    ox.graph_from_point, PREVIEW_COORDS, dist=PREVIEW_DISTANCE,
+                    dist_type='bbox', network_type='all'
+                )
+                future_water = executor.submit(fetch_features, {'natural': 'water', 'waterway': 'riverbank'})
+                future_parks = executor.submit(fetch_features, {'leisure': 'park', 'landuse': 'grass'})
+                
+                G = future_streets.result()
+                water = future_water.result()
+                parks = future_parks.result()
+            
+            print("  ✓ Map data downloaded")
+            save_cached_map_data((G, water, parks))
         
-    except Exception as e:
-        print(f"✗ Error fetching map data: {e}")
-        return 1
+        except Exception as e:
+            print(f"✗ Error fetching map data: {e}")
+            return 1
+    
+    # Project everything to the graph's local UTM zone once, so every
+    # theme draws in metres without per-plot coordinate handling
+    G = ox.project_graph(G)
+    crs = G.graph['crs']
+    edge_segments = build_edge_segments(G)
+    water = prepare_area_features(water, crs, edge_segments[1])
+    parks = prepare_area_features(parks, crs, edge_segments[1])
+    print(f"  ✓ Map data projected to {crs}")
     
-    # Generate previews for each theme
-    print(f"Generating previews for {len(theme_files)} themes...")
     print()
     
-    success_count = 0
-    error_count = 0
+    # Generate previews for each theme. Themes are independent, so they
+    # render in separate processes (matplotlib is not thread-safe)
+    workers = min(PREVIEW_WORKERS, len(themes)) or 1
+    print(f"Generating previews for {len(themes)} themes in {workers} processes...")
+    print()
     
-    for theme_file in theme_files:
-        theme_name = theme_file.stem
-        output_path = OUTPUT_DIR / f"{theme_name}_preview.png"
-        
-        print(f"[{success_count + error_count + 1}/{len(theme_files)}] {theme_name}")
-        
-        # Load theme
-        theme = load_theme(theme_file)
-        if not theme:
-            error_count += 1
-            continue
-        
-        # Generate preview
-        try:
-            generate_preview(theme_name, theme, G, water, parks, fonts, output_path)
-            success_count += 1
-        except Exception as e:
-            print(f"    ✗ Error: {e}")
-            error_count += 1
-        
-        print()
+    # Map geometry is the same for every theme: rasterize it once and let
+    # each theme only recolor it
+    map_layers = render_map_layers(edge_segments, classify_edges(G), water, parks)
+    data = (map_layers, build_font_properties(fonts))
+    data_path = None
+    if MP_CONTEXT.get_start_method() == 'fork':
+        initargs = (data,)
+    else:
+        fd, data_path = tempfile.mkstemp(prefix='preview_data_', suffix='.pkl')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        initargs = (None, data_path)
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=MP_CONTEXT,
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            futures = {
+                pool.submit(_render_in_worker, theme_name, theme, preview_path(theme_name)): theme_name
+                for theme_name, theme in themes.items()
+            }
+            
+            for future in as_completed(futures):
+                theme_name = futures[future]
+                print(f"[{success_count + error_count + skipped_count + 1}/{len(theme_files)}] {theme_name}")
+                try:
+                    future.result()
+                    success_count += 1
+                except Exception as e:
+                    print(f"    ✗ Error: {e}")
+                    error_count += 1
+    finally:
+        if data_path is not None:
+            os.unlink(data_path)
+    
+    print()
     
     # Summary
     print("=" * 60)
     print("Generation Complete!")
     print("=" * 60)
     print(f"  Success: {success_count}")
+    print(f"  Skipped: {skipped_count}")
     print(f"  Errors:  {error_count}")
     print(f"  Total:   {len(theme_files)}")
     print()